@@ -0,0 +1,50 @@
+import utilsuite
+import numpy as np
+import shutil
+import pickle
+
+def train(config):
+    if config.lr > 0.05 and config.net['depth'] == 4:
+        raise RuntimeError('diverged')
+    return config.exp_name, config.lr, config.net['depth']
+
+if __name__ == '__main__':
+    shutil.rmtree('/tmp/test_configyaml', ignore_errors=True)
+    config = utilsuite.ConfigYAML()
+    config.lr = 0.01
+    config.net = {'depth': 2, 'width': 64}
+    config.weights = np.zeros((256, 256)) # larger than array_threshold: stored as a .npy sidecar
+    config.save('/tmp/test_configyaml/config.yaml')
+    loaded = utilsuite.ConfigYAML()
+    loaded.load('/tmp/test_configyaml/config.yaml')
+    print(type(loaded.weights), loaded.weights.shape, loaded.net)
+
+    # frozen snapshots: hashable, picklable, equal when the values are
+    frozen = config.freeze()
+    print(frozen.lr, frozen.net.depth, hash(frozen) == hash(loaded.freeze()), pickle.loads(pickle.dumps(frozen)) == frozen)
+    odd = utilsuite.FrozenConfig.create({'__private': 1, 'learning-rate': 0.1})
+    print(odd['__private'], odd['learning-rate'])
+
+    # memoization keyed by the fields the function reads
+    cache = utilsuite.ConfigCache('/tmp/test_configyaml/cache')
+    calls = []
+    @cache.memoize('net.depth')
+    def build(config, scale):
+        calls.append(scale)
+        return np.full(config.net['depth'], scale)
+    build(config, 2)
+    build(config, 2) # hit
+    config.lr = 0.1  # not a selected field: still a hit
+    build(frozen, 2)
+    build(config, 3) # other call argument: miss
+    print(len(calls), cache.stats())
+    assert len(calls) == 2
+
+    # sweep on a process pool; failed runs are reported, finished ones skipped on restart
+    sweep = utilsuite.ConfigSweep(config, grid={'lr': [0.01, 0.1], 'net.depth': [2, 4]},
+                                  random={'net.width': [32, 64, 128]}, n_random=2,
+                                  save_dir='/tmp/test_configyaml/sweep')
+    results = sweep.run(train, workers=4)
+    for name, result in results.items():
+        print(name, result)
+    print('resumed:', sorted(sweep.run(train, workers=4))) # only the two diverged runs again
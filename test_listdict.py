@@ -0,0 +1,85 @@
+import utilsuite
+import numpy as np
+rec = utilsuite.ListDict(columnar=True) # keys are contiguous NumPy buffers
+rec.init('pos', 'loss')
+for i in range(1000):
+    rec.pos.append(np.ones(3) * i)
+    rec.loss.append(1 / (i + 1))
+print(rec.pos.array.shape, rec.pos.array.dtype) # (1000, 3) float64, zero-copy view
+print(np.mean(rec.loss))
+rec.pop(index=0)
+rec.save_onefile(save_dir='/tmp/', filename='listdict_test')
+rec2 = utilsuite.ListDict(columnar=True)
+rec2.load_onefile(save_dir='/tmp/', filename='listdict_test')
+print(len(rec2.pos), rec2.pos[0])
+
+# stream only the new rows to disk and keep memory bounded
+import shutil
+shutil.rmtree('/tmp/listdict_stream.chunks', ignore_errors=True) # stream_open appends to an existing store
+rec3 = utilsuite.ListDict()
+rec3.init('step')
+rec3.stream_open(save_dir='/tmp/', filename='listdict_stream', evict=True)
+for i in range(100):
+    rec3.step.append(i)
+    if i % 10 == 9: rec3.stream_flush()
+rec3.stream_close()
+rec4 = utilsuite.ListDict()
+rec4.load_onefile(save_dir='/tmp/', filename='listdict_stream')
+print(len(rec3.step), len(rec4.step))
+
+# column layout: one raw .npy member per key, loadable one key at a time and memory-mapped
+rec.save_onefile(save_dir='/tmp/', filename='listdict_columns', layout='columns')
+rec5 = utilsuite.ListDict()
+rec5.load_onefile('pos', save_dir='/tmp/', filename='listdict_columns', mmap=True)
+print(type(rec5.pos), rec5.pos[-1])
+
+# multi-threaded codecs; compare ratio against wall time on this recording
+rec.save_onefile(save_dir='/tmp/', filename='listdict_lzma', compress='lzma', workers=4)
+rec.benchmark_codecs()
+
+# running aggregates on every append, no list materialisation
+rec6 = utilsuite.ListDict()
+rec6.init('loss', stats=True, ema=0.1)
+for i in range(1000):
+    rec6.loss.append(np.random.rand())
+print(rec6.get_stats('loss'))
+
+# rows are never cast lossily: an inferred dtype widens, an explicit one raises
+col = utilsuite.ArrayColumn()
+col.append(np.int8(1))
+col.extend(np.array([1000, 2000]))
+print(col.array, col.array.dtype) # [1 1000 2000] int64
+col = utilsuite.ArrayColumn(dtype=np.int8)
+col.extend([1, 2]) # values that fit are stored as is
+try:
+    col.append(1000) # used to wrap around to -24
+except TypeError as e:
+    print(e)
+col = utilsuite.ArrayColumn(dtype=np.float32)
+col.append(0.1) # Python floats take the column precision
+try:
+    col.extend(np.array([0.1])) # float64 0.1 would be rounded
+except TypeError as e:
+    print(e)
+
+# background save: the rows at call time are written while appends go on
+rec.save_onefile(save_dir='/tmp/', filename='listdict_background', layout='columns', background=True)
+rec.loss.append(-1.0) # not part of the saved snapshot
+rec.wait()
+rec7 = utilsuite.ListDict()
+rec7.load_onefile(save_dir='/tmp/', filename='listdict_background')
+print(len(rec7.loss), len(rec.loss)) # 999 1000
+
+# sliding windows: keep the last 3 rows, and stream every row ever appended
+shutil.rmtree('/tmp/listdict_ring.chunks', ignore_errors=True)
+win = utilsuite.ListDict()
+win.init('x', capacity=3)
+win.stream_open(save_dir='/tmp/', filename='listdict_ring')
+for i in range(10):
+    win.x.append(i)
+    win.stream_flush()
+print(win.x.array, win.x.mean(), win.x.evicted) # [7 8 9] 8.0 7
+win.stream_close()
+win2 = utilsuite.ListDict()
+win2.load_onefile(save_dir='/tmp/', filename='listdict_ring')
+print(np.asarray(win2.x)) # 0..9
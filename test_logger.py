@@ -0,0 +1,52 @@
+import utilsuite
+import multiprocessing as mp
+import os
+import shutil
+
+logger = None
+def init(shared):
+    global logger
+    logger = shared
+
+def work(i):
+    logger.line(f'item {i}', print_line=False) # batched in the worker, sent to the parent's consumer
+    return i
+
+def record(shared, n):
+    init(shared)
+    for step in range(n):
+        logger.line(f'step {step}', print_line=False)
+        logger.metrics(step=step, loss=1 / (step + 1))
+
+if __name__ == '__main__':
+    shutil.rmtree('/tmp/test_logger', ignore_errors=True)
+    # Pool.__exit__ terminates the workers: their pending batches are sent on SIGTERM
+    logger = utilsuite.Logger('/tmp/test_logger/', 'pool', buffered=True, multiprocess=True, batch_interval=5)
+    with mp.Pool(4, initializer=init, initargs=(logger,)) as pool:
+        pool.map(work, range(20))
+    logger.close()
+    lines = open('/tmp/test_logger/pool.txt').read().count('item')
+    print('pool lines:', lines, 'of', 20)
+    assert lines == 20
+
+    # fork and spawn children write lines and metrics through the parent
+    for method in ('fork', 'spawn'):
+        ctx = mp.get_context(method)
+        logger = utilsuite.Logger('/tmp/test_logger/', method, multiprocess=True, mp_context=ctx)
+        procs = [ctx.Process(target=record, args=(logger, 100)) for _ in range(3)]
+        for p in procs: p.start()
+        for p in procs: p.join()
+        logger.close()
+        lines = open(f'/tmp/test_logger/{method}.txt').read().count('step')
+        metrics = logger.read_metrics('step', 'loss')
+        print(method, 'lines:', lines, 'metrics:', len(metrics['step']), 'of', 300)
+        assert lines == 300 and len(metrics['step']) == 300
+
+    # source snapshots: hashed into a shared store, restored from the manifest
+    package = os.path.dirname(os.path.abspath(utilsuite.__file__))
+    logger = utilsuite.Logger('/tmp/test_logger/run_0/', 'snap', create_file=False)
+    manifest = logger.write_file(package, snapshot=True) # store: /tmp/test_logger/snapshot_store
+    utilsuite.Logger.restore_snapshot(manifest, '/tmp/test_logger/restored')
+    same = open('/tmp/test_logger/restored/utilsuite/logger.py').read() == open(os.path.join(package, 'logger.py')).read()
+    print('restored:', same)
+    assert same
@@ -0,0 +1,32 @@
+import utilsuite
+import numpy as np
+import multiprocessing as mp
+
+rec = None
+def init(shared):
+    global rec
+    rec = shared
+
+def work(i):
+    for k in range(100): # written in place into the parent's shared buffers
+        rec.obs.append(np.full(3, i * 1000 + k, dtype=np.float32))
+        rec.step.append(i)
+    return i
+
+if __name__ == '__main__':
+    for method in ('fork', 'spawn'):
+        ctx = mp.get_context(method)
+        rec = utilsuite.SharedListDict(capacity=10000, mp_context=ctx)
+        rec.init('obs', dtype=np.float32, shape=(3,))
+        rec.init('step', dtype=np.int64)
+        with ctx.Pool(4, initializer=init, initargs=(rec,)) as pool:
+            pool.map(work, range(20))
+        rows = len(set(rec.obs.array[:, 0].tolist()))
+        print(method, rec.obs.array.shape, 'distinct rows:', rows, 'rows per item:', set(np.bincount(rec.step.array).tolist()))
+        assert rows == 2000
+        # same file format as a single-process ListDict
+        rec.save_onefile(save_dir='/tmp/', filename='sharedlistdict_test', layout='columns')
+        rec2 = utilsuite.ListDict(columnar=True)
+        rec2.load_onefile(save_dir='/tmp/', filename='sharedlistdict_test')
+        print(rec2.obs.array.shape, np.array_equal(rec2.obs.array, rec.obs.array))
+        rec.close()
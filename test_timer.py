@@ -0,0 +1,17 @@
+import utilsuite
+import time
+timer = utilsuite.Timer(trace=10000) # keep the last 10000 span events for export
+
+@timer.span('step')
+def step():
+    with timer.span('compute'): # recorded as 'loop/step/compute'
+        time.sleep(0.001)
+
+for i in range(10):
+    with timer.span('loop'):
+        step()
+        time.sleep(0.002)
+timer.report()
+print(f"span overhead: {timer.overhead():.0f} ns")
+timer.export_chrome_trace('/tmp/timer_trace.json') # open in https://ui.perfetto.dev
+timer.export_collapsed('/tmp/timer_stacks.txt') # flamegraph.pl /tmp/timer_stacks.txt > flame.svg
@@ -1,20 +1,36 @@
 _lazy_functions = {
+    "ArrayColumn": ("listdict", "ArrayColumn"),
+    "ConfigCache": ("configyaml", "ConfigCache"),
+    "ConfigSweep": ("configyaml", "ConfigSweep"),
     "ConfigYAML": ("configyaml", "ConfigYAML"),
     "Conv2DLayer": ("torch_utils", "Conv2DLayer"),
     "DataProcessor": ("dataprocessor", "DataProcessor"),
     "Dataset": ("torch_utils", "Dataset"),
+    "FrozenConfig": ("configyaml", "FrozenConfig"),
     "GeodesicLoss": ("rotation_utils", "GeodesicLoss"),
     "LinearLayer": ("torch_utils", "LinearLayer"),
     "ListDict": ("listdict", "ListDict"),
+    "LogHistogram": ("timer", "LogHistogram"),
     "Logger": ("logger", "Logger"),
     "Polar2Cartesian": ("jax_utils", "Polar2Cartesian"),
     "PositionalEncoding": ("torch_utils", "PositionalEncoding"),
     "PositionalEncoding_jax": ("jax_utils", "PositionalEncoding_jax"),
     "PositionalEncoding_torch": ("torch_utils", "PositionalEncoding_torch"),
     "QtMatplotlib": ("qtmatplotlib", "QtMatplotlib"),
+    "RingColumn": ("listdict", "RingColumn"),
+    "RunningStats": ("listdict", "RunningStats"),
+    "SharedColumn": ("listdict", "SharedColumn"),
+    "SharedListDict": ("listdict", "SharedListDict"),
+    "StatsList": ("listdict", "StatsList"),
     "Timer": ("timer", "Timer"),
+    "TimerSpan": ("timer", "TimerSpan"),
     "TransConv2DLayer": ("torch_utils", "TransConv2DLayer"),
+    "_Dumper": ("configyaml", "_Dumper"),
+    "_Loader": ("configyaml", "_Loader"),
+    "_PyLoader": ("configyaml", "_PyLoader"),
+    "_Sidecar": ("configyaml", "_Sidecar"),
     "_axis_angle_rotation": ("rotation_utils", "_axis_angle_rotation"),
+    "_run_sweep_job": ("configyaml", "_run_sweep_job"),
     "angle_w_z": ("rotation_utils", "angle_w_z"),
     "cholesky_truncated_gaussian_2d_adjusted": ("jax_utils", "cholesky_truncated_gaussian_2d_adjusted"),
     "colorPalette": ("colorpalette", "colorPalette"),
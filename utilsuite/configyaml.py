@@ -1,66 +1,642 @@
 import yaml, os
 import numpy as np
 from pathlib import Path
+try: # libyaml bindings are much faster than the pure-Python parser/emitter
+    from yaml import CSafeLoader as SafeLoader, CDumper as Dumper
+except ImportError:
+    from yaml import SafeLoader, Dumper
+
+class _Sidecar(str):
+    """Path of an array stored next to the YAML file, relative to its directory."""
+
+class _Loader(SafeLoader):
+    pass
+
+class _PyLoader(yaml.SafeLoader):
+    """Pure-Python parser with the same tags, the baseline of `benchmark_load`."""
+
+class _Dumper(Dumper):
+    pass
+
+_Loader.add_constructor('!npy', lambda loader, node: _Sidecar(loader.construct_scalar(node)))
+_PyLoader.add_constructor('!npy', lambda loader, node: _Sidecar(loader.construct_scalar(node)))
+_Dumper.add_representer(_Sidecar, lambda dumper, data: dumper.represent_scalar('!npy', str(data)))
+
 class ConfigYAML():
     """
     A configuration helper class for reading from and writing to YAML files.
 
     This class allows loading a YAML file into instance attributes and saving
     both instance and class attributes back to a YAML file. NumPy arrays are 
-    automatically converted to lists when saving to ensure YAML compatibility.
+    automatically converted to lists when saving to ensure YAML compatibility,
+    except arrays larger than `array_threshold` bytes, which go to a `.npy`
+    sidecar in `<filename>.arrays/` and are referenced with a `!npy` tag.
+    Sidecar arrays are loaded back as copy-on-write memory maps, so only the
+    pages that are actually read are touched.
+
+    YAML is parsed with libyaml (`CSafeLoader`) and written with `CDumper`
+    when PyYAML was built with it. Parsed files are cached in-process, keyed
+    by absolute path, mtime, size and content hash: loading an unchanged file
+    again skips reading and parsing entirely, and a touched but identical file
+    only costs a read and a hash.
 
     Methods:
     --------
-    load(filename):
+    load(filename, cache=True):
         Loads key-value pairs from the YAML file and sets them as instance attributes.
+        Every load gets its own copy of the values, even from the cache.
 
-    save(filename):
+    save(filename, array_threshold=1 << 16):
         Saves instance and class attributes to the specified YAML file.
         Automatically creates the output directory if it doesn't exist.
-        NumPy arrays are converted to lists for serialization.
+        NumPy arrays are converted to lists for serialization, or written as
+        `.npy` sidecars above `array_threshold` bytes (None keeps all inline).
+
+    freeze(schema=None):
+        Returns an immutable, hashable `FrozenConfig` snapshot of the config,
+        e.g. for `jax_jit(static_argnums=...)`. `schema` optionally maps keys to
+        a type or (type, min, max) and is checked before freezing.
+
+    benchmark_load(filename, n=100):
+        Times pure-Python parsing, libyaml parsing and cached loads of a file.
     """
+    _cache = {} # abspath -> (mtime_ns, size, sha256, pickled dict)
     def __init__(self) -> None:
         pass
     
-    def load(self, filename):
-        d = yaml.safe_load(Path(filename).read_text())
+    def load(self, filename, cache=True):
+        d = self._load_cached(filename) if cache else yaml.load(Path(filename).read_text(), Loader=_Loader)
+        root = os.path.dirname(os.path.abspath(filename))
         for key in d:
-            setattr(self, key, d[key])
+            setattr(self, key, self._resolve(d[key], root))
+
+    @classmethod
+    def _resolve(cls, value, root):
+        # sidecars are opened after the (pickled) cache so they are never copied into memory
+        if isinstance(value, _Sidecar):
+            return np.load(os.path.join(root, value), mmap_mode='c')
+        if isinstance(value, dict):
+            return {k: cls._resolve(v, root) for k, v in value.items()}
+        if isinstance(value, list):
+            return [cls._resolve(v, root) for v in value]
+        return value
 
-    def save(self, filename):
+    @classmethod
+    def _load_cached(cls, filename):
+        import hashlib, pickle
+        path = os.path.abspath(filename)
+        st = os.stat(path)
+        entry = cls._cache.get(path)
+        if entry is not None and entry[0] == st.st_mtime_ns and entry[1] == st.st_size:
+            return pickle.loads(entry[3])
+        data = Path(path).read_bytes()
+        digest = hashlib.sha256(data).hexdigest()
+        if entry is not None and entry[2] == digest:
+            payload = entry[3]
+        else:
+            payload = pickle.dumps(yaml.load(data, Loader=_Loader), protocol=pickle.HIGHEST_PROTOCOL)
+        cls._cache[path] = (st.st_mtime_ns, st.st_size, digest, payload)
+        # a copy per load, so mutating the config never changes the cache
+        return pickle.loads(payload)
+
+    def _items(self):
+        # class attributes first, then instance attributes (which override them)
+        items = {}
+        for d in (vars(self.__class__), vars(self)):
+            for key in d:
+                if not (key.startswith('__') or key in vars(ConfigYAML)):
+                    items[key] = d[key]
+        return items
+
+    def save(self, filename, array_threshold=1 << 16):
         path = filename.rpartition('/')[0]
         if path != '' and not os.path.exists(path):
             os.makedirs(path)
-        d = vars(self)
-        class_d = vars(self.__class__)
-        d_out = {}
-        for key in list(class_d.keys()):
-            if not (key.startswith('__') or \
-                    key == 'load' or \
-                    key == 'save'):
-                if isinstance(class_d[key], np.ndarray):
-                    d_out[key] = class_d[key].tolist()
-                else:
-                    d_out[key] = class_d[key]
-        for key in list(d.keys()):
-            if not (key.startswith('__') or \
-                    key == 'load' or \
-                    key == 'save'):
-                if isinstance(d[key], np.ndarray):
-                    d_out[key] = d[key].tolist()
-                else:
-                    d_out[key] = d[key]
+        sidecar = os.path.basename(filename) + '.arrays'
+        def convert(value, name):
+            if isinstance(value, np.ndarray):
+                if array_threshold is None or value.nbytes <= array_threshold or value.dtype.hasobject:
+                    return value.tolist()
+                os.makedirs(os.path.join(path, sidecar), exist_ok=True)
+                rel = os.path.join(sidecar, name + '.npy')
+                target = os.path.abspath(os.path.join(path, rel))
+                if isinstance(value, np.memmap) and value.filename == target and \
+                        np.array_equal(value, np.load(target, mmap_mode='r')):
+                    return _Sidecar(rel) # loaded from this sidecar and not modified
+                # a loaded memmap may still be reading the old file, so never truncate it in place
+                tmp = f"{target}.{os.getpid()}.tmp"
+                with open(tmp, 'wb') as f:
+                    np.save(f, value)
+                os.replace(tmp, target)
+                return _Sidecar(rel)
+            if isinstance(value, dict):
+                return {k: convert(v, f"{name}.{k}") for k, v in value.items()}
+            return value
+        d_out = {key: convert(value, key) for key, value in self._items().items()}
         with open(filename, 'w+') as ff:
-            yaml.dump_all([d_out], ff)
-            
+            yaml.dump_all([d_out], ff, Dumper=_Dumper)
+
+    def freeze(self, schema=None):
+        items = self._items()
+        if schema is not None:
+            FrozenConfig.validate(items, schema)
+        return FrozenConfig.create(items)
+
     def __str__(self):
         d = vars(self)
         class_d = vars(self.__class__)
         return '\n'.join([f"{key}: {d[key]}" for key in d if not (key.startswith('__') or \
-                                                                  key == 'load' or \
-                                                                  key == 'save')]) + \
+                                                                  key in vars(ConfigYAML))]) + \
                '\n' + \
                '\n'.join([f"{key}: {class_d[key]}" for key in class_d if not (key.startswith('__') or \
-                                                                              key == 'load' or \
-                                                                              key == 'save')])
-            
+                                                                              key in vars(ConfigYAML))])
+
+    @classmethod
+    def benchmark_load(cls, filename, n=100):
+        import time
+        text = Path(filename).read_text()
+        timings = {}
+        t0 = time.perf_counter()
+        for _ in range(n):
+            yaml.load(text, Loader=_PyLoader)
+        timings['python'] = (time.perf_counter() - t0) / n
+        t0 = time.perf_counter()
+        for _ in range(n):
+            yaml.load(text, Loader=_Loader)
+        timings['libyaml'] = (time.perf_counter() - t0) / n
+        cls().load(filename)
+        t0 = time.perf_counter()
+        for _ in range(n):
+            cls().load(filename)
+        timings['cached'] = (time.perf_counter() - t0) / n
+        for name, t in timings.items():
+            print(f"{name:>8}: {t * 1e3:9.3f} ms/load  ({timings['python'] / t:7.1f}x)")
+        return timings
+
+class FrozenConfig:
+    """
+    Immutable, hashable snapshot of a `ConfigYAML`, created by `ConfigYAML.freeze()`.
+
+    Each distinct set of keys gets its own `__slots__` subclass, so attribute
+    reads are plain slot loads. Keys that are not identifiers, start with
+    `__` or clash with the methods are only reachable as
+    `frozen['learning-rate']`. Values are
+    frozen recursively: lists become tuples, dicts become nested
+    `FrozenConfig`s and arrays become read-only copies. Hash and equality are
+    computed from the content (arrays by dtype, shape and bytes), so two
+    snapshots of equal configs hit the same `jax.jit` cache entry when passed
+    as a static argument. Snapshots pickle (e.g. to process pools) by
+    rebuilding from `to_dict()`; `copy`/`deepcopy` return the snapshot itself.
+
+    Methods:
+    --------
+    to_dict():
+        Plain nested dict of the values.
+
+    thaw():
+        A new, mutable `ConfigYAML` with the same values.
+
+    validate(items, schema):
+        Checks a dict against {key: type | (type, min, max)}; raises KeyError,
+        TypeError or ValueError.
+    """
+    __slots__ = ('_key', '_hash', '_values')
+    _classes = {}
+
+    @classmethod
+    def create(cls, items):
+        keys = tuple(items.keys())
+        sub = cls._classes.get(keys)
+        if sub is None:
+            # '__x' slots would be name-mangled to '_FrozenConfig__x'
+            slots = tuple(k for k in keys if isinstance(k, str) and k.isidentifier() and not k.startswith('__')
+                          and not hasattr(FrozenConfig, k))
+            sub = cls._classes[keys] = type('FrozenConfig', (FrozenConfig,), {'__slots__': slots})
+        obj = object.__new__(sub)
+        values, key = {}, []
+        for name, value in items.items():
+            values[name], hashable = cls._freeze(value)
+            key.append((name, hashable))
+        for name in sub.__slots__:
+            object.__setattr__(obj, name, values[name])
+        object.__setattr__(obj, '_values', values)
+        object.__setattr__(obj, '_key', tuple(key))
+        object.__setattr__(obj, '_hash', hash(obj._key))
+        return obj
+
+    @classmethod
+    def _freeze(cls, value):
+        # returns (frozen value, hashable stand-in used for __hash__/__eq__)
+        if isinstance(value, dict):
+            value = cls.create(value)
+            return value, value
+        if isinstance(value, (list, tuple)):
+            pairs = [cls._freeze(v) for v in value]
+            return tuple(v for v, _ in pairs), ('__seq__',) + tuple(h for _, h in pairs)
+        if isinstance(value, np.ndarray):
+            value = value.copy()
+            value.setflags(write=False)
+            return value, ('__ndarray__', str(value.dtype), value.shape, value.tobytes())
+        return value, value
+
+    @staticmethod
+    def validate(items, schema):
+        for key, rule in schema.items():
+            if key not in items:
+                raise KeyError(f"FrozenConfig: missing config key '{key}'")
+            kind, low, high = (rule, None, None) if not isinstance(rule, tuple) else rule
+            value = items[key]
+            if kind is float and isinstance(value, int) and not isinstance(value, bool):
+                value = float(value)
+            if kind is not None and not isinstance(value, kind):
+                raise TypeError(f"FrozenConfig: '{key}' should be {kind.__name__}, got {type(value).__name__}")
+            if (low is not None and value < low) or (high is not None and value > high):
+                raise ValueError(f"FrozenConfig: '{key}' = {value} outside [{low}, {high}]")
+
+    def __setattr__(self, name, value):
+        raise AttributeError('FrozenConfig is immutable, use thaw() to get an editable copy')
+
+    def __delattr__(self, name):
+        raise AttributeError('FrozenConfig is immutable, use thaw() to get an editable copy')
+
+    def __hash__(self):
+        return self._hash
+
+    def __getitem__(self, name):
+        return self._values[name]
+
+    def __reduce__(self):
+        return FrozenConfig.create, (self.to_dict(),)
+
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        return self
+
+    def __eq__(self, other):
+        return isinstance(other, FrozenConfig) and self._hash == other._hash and self._key == other._key
+
+    def to_dict(self):
+        def unfreeze(value):
+            if isinstance(value, FrozenConfig):
+                return value.to_dict()
+            if isinstance(value, tuple):
+                return [unfreeze(v) for v in value]
+            return value
+        return {name: unfreeze(value) for name, value in self._values.items()}
+
+    def thaw(self):
+        config = ConfigYAML()
+        for name, value in self.to_dict().items():
+            setattr(config, name, value.copy() if isinstance(value, np.ndarray) else value)
+        return config
+
+    def __repr__(self):
+        return 'FrozenConfig(' + ', '.join(f"{name}={value!r}" for name, value in self._values.items()) + ')'
+
+class ConfigCache:
+    """
+    On-disk memoization of results keyed by the config fields they depend on.
+
+    The key is a SHA-256 over the function identity (module, qualified name,
+    bytecode, constants and names, including nested functions, so editing
+    the function invalidates its entries), the selected config fields and
+    the remaining call arguments. Values are
+    hashed by content, so a reloaded or frozen config with the same values
+    hits the same entry. Arrays and dicts of arrays are stored as `.npz`,
+    anything else is pickled. Once the store exceeds `max_bytes` the least
+    recently used entries are deleted.
+
+    Usage:
+    ------
+    cache = ConfigCache('cache')
+    @cache.memoize('dataset', 'preprocess.window')
+    def preprocess(config, split): ...
+    preprocess(config, 'train')   # first argument is the ConfigYAML / FrozenConfig / dict
+
+    Methods:
+    --------
+    memoize(*fields):
+        Decorator. Dotted names select nested dict entries; no fields means
+        the whole config.
+
+    stats():
+        Hits, misses, evictions, hit rate, entry count and stored bytes.
+
+    clear():
+        Deletes every entry.
+    """
+    def __init__(self, cache_dir='.config_cache', max_bytes=1 << 30):
+        from collections import OrderedDict
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.hits = self.misses = self.evictions = 0
+        os.makedirs(cache_dir, exist_ok=True)
+        entries = []
+        for name in os.listdir(cache_dir):
+            if name.endswith(('.npz', '.pkl')):
+                st = os.stat(os.path.join(cache_dir, name))
+                entries.append((st.st_mtime_ns, name, st.st_size))
+        self._entries = OrderedDict((name, size) for _, name, size in sorted(entries))
+        self._bytes = sum(self._entries.values())
+
+    def memoize(self, *fields):
+        import functools
+        def decorator(func):
+            code = getattr(func, '__code__', None)
+            identity = (func.__module__, func.__qualname__, self._code_identity(code) if code is not None else b'')
+            @functools.wraps(func)
+            def wrapped(config, *args, **kwargs):
+                key = self.key(identity, self._select(config, fields), args, kwargs)
+                found, result = self.get(key)
+                if found:
+                    return result
+                result = func(config, *args, **kwargs)
+                self.put(key, result)
+                return result
+            wrapped.cache = self
+            return wrapped
+        return decorator
+
+    @classmethod
+    def _code_identity(cls, value):
+        # bytecode alone misses edited constants and names, so walk them and nested code objects too
+        if hasattr(value, 'co_code'):
+            return ('code', value.co_code, value.co_names, cls._code_identity(value.co_consts))
+        if isinstance(value, tuple):
+            return tuple(cls._code_identity(v) for v in value)
+        if isinstance(value, frozenset):
+            return ('frozenset',) + tuple(sorted((cls._code_identity(v) for v in value), key=repr))
+        return value
+
+    @staticmethod
+    def _select(config, fields):
+        if isinstance(config, FrozenConfig):
+            items = config.to_dict()
+        elif isinstance(config, ConfigYAML):
+            items = config._items()
+        else:
+            items = dict(config)
+        if not fields:
+            return items
+        selected = {}
+        for field in fields:
+            value = items
+            for part in field.split('.'):
+                value = value[part]
+            selected[field] = value
+        return selected
+
+    @classmethod
+    def key(cls, *parts):
+        import hashlib
+        h = hashlib.sha256()
+        cls._digest(h, parts)
+        return h.hexdigest()
+
+    @classmethod
+    def _digest(cls, h, value):
+        # type-tagged, order-independent for dicts, so equal values always give equal keys
+        if isinstance(value, FrozenConfig):
+            value = value.to_dict()
+        if isinstance(value, dict):
+            h.update(b'd%d' % len(value))
+            for k in sorted(value, key=repr):
+                cls._digest(h, k)
+                cls._digest(h, value[k])
+        elif isinstance(value, (list, tuple)):
+            h.update(b'l%d' % len(value))
+            for v in value:
+                cls._digest(h, v)
+        elif isinstance(value, np.ndarray) and not value.dtype.hasobject:
+            h.update(f"a{value.dtype.str}{value.shape}".encode())
+            h.update(np.ascontiguousarray(value).tobytes())
+        elif isinstance(value, (bytes, bytearray)):
+            h.update(b'b%d' % len(value))
+            h.update(value)
+        elif value is None or isinstance(value, (bool, int, float, str, np.generic)):
+            text = f"{type(value).__name__}:{value!r}".encode()
+            h.update(b's%d' % len(text))
+            h.update(text)
+        else:
+            import pickle
+            data = pickle.dumps(value, protocol=4)
+            h.update(b'p%d' % len(data))
+            h.update(data)
+
+    def get(self, key):
+        for ext in ('.npz', '.pkl'):
+            name = key + ext
+            if name in self._entries:
+                path = os.path.join(self.cache_dir, name)
+                try:
+                    result = self._read(path)
+                except OSError: # removed by another process
+                    self._forget(name)
+                    continue
+                self._entries.move_to_end(name)
+                os.utime(path)
+                self.hits += 1
+                return True, result
+        self.misses += 1
+        return False, None
+
+    def put(self, key, result):
+        import pickle
+        arrays = None
+        if isinstance(result, np.ndarray) and not result.dtype.hasobject:
+            arrays = {'__array__': result}
+        elif isinstance(result, dict) and result and all(isinstance(k, str) and isinstance(v, np.ndarray)
+                                                         and not v.dtype.hasobject for k, v in result.items()):
+            arrays = result
+        name = key + ('.npz' if arrays is not None else '.pkl')
+        path = os.path.join(self.cache_dir, name)
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, 'wb') as f:
+            if arrays is not None:
+                np.savez(f, **arrays)
+            else:
+                pickle.dump(result, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, path)
+        self._forget(name)
+        self._entries[name] = os.path.getsize(path)
+        self._bytes += self._entries[name]
+        self._evict()
+
+    @staticmethod
+    def _read(path):
+        if path.endswith('.npz'):
+            with np.load(path, allow_pickle=False) as data:
+                if data.files == ['__array__']:
+                    return data['__array__']
+                return {k: data[k] for k in data.files}
+        import pickle
+        with open(path, 'rb') as f:
+            return pickle.load(f)
+
+    def _forget(self, name):
+        self._bytes -= self._entries.pop(name, 0)
+
+    def _evict(self):
+        # keep the newest entry even if it alone exceeds max_bytes
+        while self._bytes > self.max_bytes and len(self._entries) > 1:
+            name, size = self._entries.popitem(last=False)
+            self._bytes -= size
+            self.evictions += 1
+            try:
+                os.remove(os.path.join(self.cache_dir, name))
+            except FileNotFoundError:
+                pass
+
+    def stats(self):
+        total = self.hits + self.misses
+        return {'hits': self.hits, 'misses': self.misses, 'evictions': self.evictions,
+                'hit_rate': self.hits / total if total else 0.0,
+                'entries': len(self._entries), 'bytes': self._bytes}
+
+    def clear(self):
+        for name in list(self._entries):
+            try:
+                os.remove(os.path.join(self.cache_dir, name))
+            except FileNotFoundError:
+                pass
+        self._entries.clear()
+        self._bytes = 0
+
+def _run_sweep_job(fn, config, marker):
+    # runs in the worker process; the marker is only written once fn returned
+    result = fn(config)
+    Path(config.save_dir, marker).touch()
+    return result
+
+class ConfigSweep:
+    """
+    Lazily expanded hyperparameter sweep over a base `ConfigYAML`.
+
+    `grid` maps (dotted) field names to lists of values and is expanded as a
+    Cartesian product; `random` maps field names to a spec drawn `n_random`
+    times per grid point: a list (uniform choice), ('uniform', lo, hi),
+    ('loguniform', lo, hi), ('int', lo, hi) or a callable taking a NumPy
+    Generator. Run `i` always draws from a generator seeded with
+    (seed, i), so names and values are identical when a sweep is restarted.
+
+    Every run is a deep copy of the base config with `save_dir` set to
+    `<save_dir>/<exp_name>_<i>` and `exp_name` to `<exp_name>_<i>`, and is
+    saved there as `config.yaml` before it starts.
+
+    Methods:
+    --------
+    __iter__():
+        Yields (name, config) without materialising the whole sweep.
+
+    run(fn, workers=None, output='.done', mp_context=None):
+        Calls `fn(config)` for every run on a process pool of `workers`
+        (all cores by default, 0 runs inline), keeping at most two jobs per
+        worker in flight. Runs whose `<run save_dir>/<output>` already exists
+        are skipped; `.done` is written after `fn` returns. `fn` must be
+        picklable (a module-level function). Returns {name: result or
+        exception}.
+    """
+    def __init__(self, config, grid=None, random=None, n_random=1, seed=0,
+                 save_dir='sweeps', exp_name='run') -> None:
+        self.config = config
+        self.grid = dict(grid or {})
+        self.random = dict(random or {})
+        self.n_random = n_random if self.random else 1
+        self.seed = seed
+        self.save_dir = save_dir
+        self.exp_name = exp_name
+
+    def __len__(self):
+        n = self.n_random
+        for values in self.grid.values():
+            n *= len(values)
+        return n
+
+    def __iter__(self):
+        import itertools
+        keys = list(self.grid)
+        index = 0
+        for combo in itertools.product(*self.grid.values()):
+            for _ in range(self.n_random):
+                yield self._make(index, dict(zip(keys, combo)))
+                index += 1
+
+    def _make(self, index, values):
+        import copy
+        rng = np.random.default_rng([self.seed, index])
+        for key, spec in self.random.items():
+            values[key] = self._sample(spec, rng)
+        config = copy.deepcopy(self.config)
+        for key, value in values.items():
+            self._assign(config, key, value)
+        name = f"{self.exp_name}_{index:04d}"
+        config.save_dir = os.path.join(self.save_dir, name)
+        config.exp_name = name
+        return name, config
+
+    @staticmethod
+    def _sample(spec, rng):
+        if callable(spec):
+            return spec(rng)
+        if isinstance(spec, list):
+            return spec[rng.integers(len(spec))]
+        kind, low, high = spec
+        if kind == 'uniform':
+            return float(rng.uniform(low, high))
+        if kind == 'loguniform':
+            return float(np.exp(rng.uniform(np.log(low), np.log(high))))
+        if kind == 'int':
+            return int(rng.integers(low, high, endpoint=True))
+        raise ValueError(f"ConfigSweep: unknown random spec '{kind}'")
+
+    @staticmethod
+    def _assign(config, key, value):
+        parts = key.split('.')
+        if len(parts) == 1:
+            setattr(config, key, value)
+            return
+        target = getattr(config, parts[0])
+        for part in parts[1:-1]:
+            target = target[part]
+        target[parts[-1]] = value
+
+    def run(self, fn, workers=None, output='.done', mp_context=None):
+        from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+        workers = os.cpu_count() if workers is None else workers
+        results = {}
+        def pending():
+            for name, config in self:
+                if os.path.exists(os.path.join(config.save_dir, output)):
+                    continue
+                config.save(os.path.join(config.save_dir, 'config.yaml'))
+                yield name, config
+        if workers == 0:
+            for name, config in pending():
+                try:
+                    results[name] = _run_sweep_job(fn, config, '.done')
+                except Exception as e:
+                    print(f"ConfigSweep: {name} failed: {e!r}")
+                    results[name] = e
+            return results
+        jobs = pending()
+        futures = {}
+        with ProcessPoolExecutor(workers, mp_context=mp_context) as pool:
+            while True:
+                # bounded submission keeps expansion lazy for very large sweeps
+                for name, config in jobs:
+                    futures[pool.submit(_run_sweep_job, fn, config, '.done')] = name
+                    if len(futures) >= 2 * workers:
+                        break
+                if not futures:
+                    break
+                done, _ = wait(futures, return_when=FIRST_COMPLETED)
+                for future in done:
+                    name = futures.pop(future)
+                    try:
+                        results[name] = future.result()
+                    except Exception as e:
+                        print(f"ConfigSweep: {name} failed: {e!r}")
+                        results[name] = e
+        return results
@@ -1,4 +1,5 @@
 import numpy as np
+import os
 class DataProcessor():
     """
     Utility class for basic data processing tasks including range calculation,
@@ -6,16 +7,21 @@ class DataProcessor():
 
     Methods:
     --------
-    find_range(data):
+    find_range(data, chunk_rows=None, workers=None):
         Computes the min and max range for 1D or 2D numpy arrays.
         For 2D data, returns arrays of min and max for each column.
+        `data` may also be a `.npy` path (opened as a memmap); memmaps, paths
+        or an explicit `chunk_rows` are reduced chunk by chunk on a thread
+        pool, so each chunk is read from disk once and never fully loaded.
 
     find_larger_normal_params(range1, range2):
         Compares two range arrays and returns a new range selecting the larger overlapping
         intervals based on given logic. Useful for normalizing with consistent bounds.
 
-    data_normalize(data):
+    data_normalize(data, out=None, chunk_rows=None, workers=None):
         Normalizes data to the range [0, 1] and returns normalized data and original max/min.
+        With `out` (an array or a `.npy` path, created as a memmap) or an
+        out-of-core input, chunks are normalised in parallel straight into `out`.
 
     runtime_normalize(data, params):
         Normalizes data using provided parameters [max, min].
@@ -33,15 +39,36 @@ class DataProcessor():
     def __init__(self) -> None:
         pass
     
-    def find_range(self, data):
-        if len(data.shape) == 1:
-            return np.array([np.min(data), np.max(data)])
-        range_min = []
-        range_max = []
-        for k in range(data.shape[1]):
-            range_min.append(np.min(data[:, k]))
-            range_max.append(np.max(data[:, k]))
-        return np.array([range_min, range_max])
+    def find_range(self, data, chunk_rows=None, workers=None):
+        data = self._open(data)
+        if not self._chunked(data, chunk_rows):
+            return np.array([data.min(axis=0), data.max(axis=0)])
+        def reduce(start, stop):
+            # min and max of a chunk back to back, while it is still in cache/page cache
+            chunk = data[start:stop]
+            return chunk.min(axis=0), chunk.max(axis=0)
+        parts = self._map_chunks(reduce, data, chunk_rows, workers)
+        return np.array([np.min([p[0] for p in parts], axis=0), np.max([p[1] for p in parts], axis=0)])
+
+    @staticmethod
+    def _open(data):
+        if isinstance(data, (str, os.PathLike)):
+            return np.load(data, mmap_mode='r')
+        return np.asanyarray(data) # lists become arrays, a memmap stays a memmap
+
+    @staticmethod
+    def _chunked(data, chunk_rows):
+        return chunk_rows is not None or isinstance(data, np.memmap)
+
+    @staticmethod
+    def _map_chunks(fn, data, chunk_rows=None, workers=None):
+        from concurrent.futures import ThreadPoolExecutor
+        if chunk_rows is None: # about 32 MiB per chunk
+            chunk_rows = max(1, (32 << 20) // max(1, data[:1].nbytes))
+        bounds = [(start, min(start + chunk_rows, data.shape[0])) for start in range(0, data.shape[0], chunk_rows)]
+        # NumPy releases the GIL in reductions and ufuncs, so threads scale without copying chunks
+        with ThreadPoolExecutor(workers or os.cpu_count()) as pool:
+            return list(pool.map(lambda b: fn(*b), bounds))
 
     def find_larger_normal_params(self, range1, range2):
         range_ret = range1.copy()
@@ -57,12 +84,28 @@ class DataProcessor():
         #     range_ret[1, k] = np.max([range1[1, k], range2[1, k]])
         # return range_ret
     
-    def data_normalize(self, data):
-        data_min = np.min(data)
-        data = data - data_min
-        data_max = np.max(data)
-        data = data / data_max
-        return data, [float(data_max), float(data_min)]
+    def data_normalize(self, data, out=None, chunk_rows=None, workers=None):
+        data = self._open(data)
+        chunked = out is not None or self._chunked(data, chunk_rows)
+        data_range = self.find_range(data, chunk_rows, workers) if chunked else [data.min(), data.max()]
+        data_min = np.min(data_range[0])
+        dtype = np.result_type(data.dtype, 1.0)
+        data_max = np.max(data_range[1]) - data_min
+        if not chunked:
+            # one output array, normalised in place instead of two full-size temporaries
+            data = np.subtract(data, data_min, dtype=dtype)
+            data /= data_max
+            return data, [float(data_max), float(data_min)]
+        if out is None or isinstance(out, (str, os.PathLike)):
+            out = np.lib.format.open_memmap(out, mode='w+', dtype=dtype, shape=data.shape) if out is not None \
+                  else np.empty(data.shape, dtype)
+        def normalize(start, stop):
+            np.subtract(data[start:stop], data_min, out=out[start:stop], casting='unsafe')
+            np.divide(out[start:stop], data_max, out=out[start:stop], casting='unsafe')
+        self._map_chunks(normalize, data, chunk_rows, workers)
+        if isinstance(out, np.memmap):
+            out.flush()
+        return out, [float(data_max), float(data_min)]
     
     def runtime_normalize(self, data, params):
         return (data - params[1]) / params[0]
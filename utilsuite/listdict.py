@@ -1,4 +1,435 @@
+import os, json, struct, zipfile
 import numpy as np
+class RunningStats:
+    """
+    Online aggregates of a stream of scalars or equally shaped arrays.
+
+    Keeps count, Welford mean/variance, element-wise min/max and an optional
+    exponential moving average. Every query is O(1) in the number of samples,
+    and two instances can be merged (Chan et al.'s parallel update), so
+    statistics from sharded recorders combine cheaply.
+
+    Methods:
+    --------
+    update(x):
+        Add one sample.
+
+    update_many(rows):
+        Add a batch of samples (first axis) with vectorised math.
+
+    merge(other):
+        Fold the aggregates of another `RunningStats` into this one. The EMA
+        cannot be merged exactly; the one of `self` is kept if it exists.
+
+    summary():
+        Return a dict with count, mean, var, std, min, max and ema.
+
+    Usage:
+    ------
+    st = RunningStats(ema=0.1)
+    st.update(0.3)
+    st.summary()['mean']
+    """
+    def __init__(self, ema=None) -> None:
+        self.ema_alpha = ema
+        self.count = 0
+        self.mean = None
+        self.m2 = None
+        self.min = None
+        self.max = None
+        self.ema = None
+
+    def update(self, x):
+        if not isinstance(x, (int, float)):
+            x = np.array(x, dtype=np.float64)
+        self.count += 1
+        if self.count == 1:
+            self.mean, self.m2, self.min, self.max = x, x * 0.0, x, x
+            self.ema = x if self.ema_alpha is not None else None
+            return
+        delta = x - self.mean
+        self.mean = self.mean + delta / self.count
+        self.m2 = self.m2 + delta * (x - self.mean)
+        self.min = np.minimum(self.min, x)
+        self.max = np.maximum(self.max, x)
+        if self.ema_alpha is not None:
+            self.ema = self.ema + self.ema_alpha * (x - self.ema)
+
+    def update_many(self, rows):
+        rows = np.asarray(rows, dtype=np.float64)
+        if len(rows) == 0:
+            return
+        if self.ema_alpha is not None:
+            a = self.ema_alpha
+            ema, tail = (rows[0], rows[1:]) if self.ema is None else (self.ema, rows)
+            weights = a * (1 - a) ** np.arange(len(tail) - 1, -1, -1)
+            ema = (1 - a) ** len(tail) * ema + np.tensordot(weights, tail, axes=1)
+        batch = RunningStats()
+        batch.count = len(rows)
+        batch.mean = rows.mean(axis=0)
+        batch.m2 = ((rows - batch.mean) ** 2).sum(axis=0)
+        batch.min = rows.min(axis=0)
+        batch.max = rows.max(axis=0)
+        self.merge(batch)
+        self.ema = ema if self.ema_alpha is not None else self.ema
+
+    def merge(self, other):
+        if other.count == 0:
+            return self
+        if self.count == 0:
+            self.count, self.mean, self.m2 = other.count, other.mean, other.m2
+            self.min, self.max = other.min, other.max
+            self.ema = other.ema
+            return self
+        count = self.count + other.count
+        delta = other.mean - self.mean
+        self.mean = self.mean + delta * other.count / count
+        self.m2 = self.m2 + other.m2 + delta ** 2 * self.count * other.count / count
+        self.min = np.minimum(self.min, other.min)
+        self.max = np.maximum(self.max, other.max)
+        self.count = count
+        if self.ema is None:
+            self.ema = other.ema
+        return self
+
+    @property
+    def var(self):
+        return None if self.count == 0 else self.m2 / self.count
+
+    @property
+    def std(self):
+        return None if self.count == 0 else np.sqrt(self.m2 / self.count)
+
+    def summary(self):
+        return {'count': self.count, 'mean': self.mean, 'var': self.var, 'std': self.std,
+                'min': self.min, 'max': self.max, 'ema': self.ema}
+
+class StatsList(list):
+    """
+    A plain `list` that feeds every appended row into a `RunningStats`
+    (attribute `stats`). Used by `ListDict.init(..., stats=True)` for
+    non-columnar keys.
+    """
+    def __init__(self, *args, stats=None) -> None:
+        super().__init__(*args)
+        self.stats = RunningStats() if stats is None else stats
+
+    def append(self, row):
+        super().append(row)
+        self.stats.update(row)
+
+    def extend(self, rows):
+        rows = list(rows)
+        super().extend(rows)
+        self.stats.update_many(rows)
+
+def _python_floats(row):
+    return type(row) is float or (type(row) in (list, tuple) and len(row) > 0 and
+                                  all(type(v) is float for v in row))
+
+class ArrayColumn:
+    """
+    A list-like column backed by one contiguous, growable NumPy buffer.
+
+    The dtype and row shape are inferred from the first appended row (or given
+    explicitly). Rows are never cast lossily: an inferred dtype is widened
+    (e.g. int to float after `append(0.5)`), an explicit one raises TypeError.
+    Values that fit are stored as is (small ints in an int8 column), and
+    Python floats take the precision of a float column.
+    The buffer doubles its capacity when full, so appends are
+    amortised O(1) and no per-row Python objects are kept alive. Reads return
+    zero-copy views into the buffer.
+
+    Methods:
+    --------
+    append(row):
+        Append one row, growing the buffer if needed.
+
+    extend(rows):
+        Append many rows with a single vectorised copy.
+
+    pop(index=-1):
+        Remove and return the row at `index`.
+
+    clear():
+        Drop all rows but keep the allocated buffer.
+
+    snapshot():
+        Return a view of the current rows that later mutations will not touch.
+
+    from_array(arr):
+        Build a column that holds `arr` (no copy).
+
+    mean(), min(), max():
+        Reductions over rows (axis 0), computed on the buffer view.
+
+    last(k=1):
+        View of the last `k` rows.
+
+    Attributes:
+    -----------
+    array : np.ndarray
+        Zero-copy view of the valid rows, shape (len, *row_shape).
+
+    Usage:
+    ------
+    col = ArrayColumn()
+    col.append(np.zeros(3))
+    col.array.mean(axis=0)
+    """
+    def __init__(self, capacity=16, dtype=None, stats=None) -> None:
+        self.stats = stats  # optional RunningStats fed on every append
+        self._buf = None
+        self._len = 0
+        self._capacity = max(int(capacity), 1)
+        self._dtype = dtype
+        self._shared = False  # a snapshot view still points at self._buf
+
+    @classmethod
+    def from_array(cls, arr):
+        arr = np.asarray(arr)
+        col = cls(capacity=max(len(arr), 1))
+        col._buf = arr
+        col._len = len(arr)
+        return col
+
+    def _reserve(self, n, row):
+        if self._buf is None:
+            row = np.asarray(row)
+            self._buf = np.empty((max(self._capacity, n),) + row.shape,
+                                 dtype=row.dtype if self._dtype is None else self._dtype)
+        elif n > len(self._buf):
+            capacity = max(len(self._buf), 1)
+            while capacity < n:
+                capacity *= 2
+            buf = np.empty((capacity,) + self._buf.shape[1:], dtype=self._buf.dtype)
+            buf[:self._len] = self._buf[:self._len]
+            self._buf = buf
+            self._shared = False
+
+    def _fit(self, rows, weak=False):
+        # never cast silently: widen an inferred dtype, refuse for an explicit one
+        dtype = self._buf.dtype
+        if np.can_cast(rows.dtype, dtype, 'safe'):
+            return
+        if weak and dtype.kind in 'fc':
+            return # Python floats take the column's precision, as in NumPy arithmetic
+        if rows.dtype.kind in 'biuf' and dtype.kind in 'biufc':
+            with np.errstate(all='ignore'):
+                if np.array_equal(rows.astype(dtype), rows, equal_nan=True):
+                    return # the values fit, e.g. small Python ints in an int8 column
+        if self._dtype is not None:
+            raise TypeError(f"cannot store {rows.dtype} rows in a {dtype} column without loss")
+        self._buf = self._buf.astype(np.result_type(dtype, rows.dtype))
+        self._shared = False
+
+    def _unshare(self):
+        # copy-on-write so that views handed out by snapshot() stay valid
+        if self._shared:
+            self._buf = self._buf.copy()
+            self._shared = False
+
+    def append(self, row):
+        self._reserve(self._len + 1, row)
+        self._fit(np.asarray(row), _python_floats(row))
+        self._buf[self._len] = row
+        self._len += 1
+        if self.stats is not None:
+            self.stats.update(row)
+
+    def extend(self, rows):
+        weak = _python_floats(rows)
+        rows = np.asarray(rows)
+        if len(rows) == 0:
+            return
+        self._reserve(self._len + len(rows), rows[0])
+        self._fit(rows, weak)
+        self._buf[self._len:self._len + len(rows)] = rows
+        self._len += len(rows)
+        if self.stats is not None:
+            self.stats.update_many(rows)
+
+    def pop(self, index=-1):
+        arr = self.array
+        if index < 0:
+            index += self._len
+        if not 0 <= index < self._len:
+            raise IndexError('pop index out of range')
+        value = arr[index].copy()
+        self._unshare()
+        self._buf[index:self._len - 1] = self._buf[index + 1:self._len]
+        self._len -= 1
+        return value
+
+    def clear(self):
+        if self._shared:
+            # a snapshot still views the old rows, so start over in a fresh buffer
+            self._buf = np.empty_like(self._buf)
+            self._shared = False
+        self._len = 0
+
+    def snapshot(self):
+        self._shared = True
+        return self.array
+
+    def mean(self, axis=0, **kwargs):
+        return self.array.mean(axis=axis, **kwargs)
+
+    def min(self, axis=0, **kwargs):
+        return self.array.min(axis=axis, **kwargs)
+
+    def max(self, axis=0, **kwargs):
+        return self.array.max(axis=axis, **kwargs)
+
+    def last(self, k=1):
+        return self.array[max(self._len - k, 0):]
+
+    @property
+    def array(self):
+        if self._buf is None:
+            return np.empty((0,), dtype=self._dtype)
+        return self._buf[:self._len]
+
+    @property
+    def dtype(self):
+        return self.array.dtype
+
+    @property
+    def shape(self):
+        return self.array.shape
+
+    def __array__(self, dtype=None, copy=None):
+        arr = self.array
+        if dtype is not None:
+            arr = arr.astype(dtype, copy=False)
+        return arr.copy() if copy else arr
+
+    def __len__(self):
+        return self._len
+
+    def __getitem__(self, index):
+        return self.array[index]
+
+    def __setitem__(self, index, value):
+        self._unshare()
+        self.array[index] = value
+
+    def __iter__(self):
+        return iter(self.array)
+
+    def __repr__(self):
+        return f"ArrayColumn({self.array!r})"
+
+class RingColumn(ArrayColumn):
+    """
+    A fixed-capacity sliding window with O(1) push and eviction.
+
+    Every row is written twice into a buffer of `2 * capacity` rows (at `i` and
+    `i + capacity`), so the window in insertion order is always the contiguous
+    slice `buf[start:start + len]` and can be returned as a view without
+    copying. Once full, each append overwrites the oldest row; `pop(0)` and
+    `pop(-1)` are O(1). `evicted` counts the rows overwritten so far.
+
+    Inherits the list-like interface and the `mean`/`min`/`max`/`last`
+    window reductions of `ArrayColumn`.
+
+    Usage:
+    ------
+    win = RingColumn(100)
+    for x in stream:
+        win.append(x)
+        avg = win.mean()
+    """
+    def __init__(self, capacity, dtype=None, stats=None) -> None:
+        super().__init__(capacity, dtype, stats)
+        self._start = 0
+        self.evicted = 0
+
+    def _reserve(self, n, row):
+        if self._buf is None:
+            row = np.asarray(row)
+            self._buf = np.empty((2 * self._capacity,) + row.shape,
+                                 dtype=row.dtype if self._dtype is None else self._dtype)
+
+    def append(self, row):
+        self._reserve(1, row)
+        self._fit(np.asarray(row), _python_floats(row))
+        self._unshare()
+        cap = self._capacity
+        i = (self._start + self._len) % cap
+        self._buf[i] = row
+        self._buf[i + cap] = row
+        if self._len < cap:
+            self._len += 1
+        else:
+            self._start = (self._start + 1) % cap
+            self.evicted += 1
+        if self.stats is not None:
+            self.stats.update(row)
+
+    def extend(self, rows):
+        weak = _python_floats(rows)
+        rows = np.asarray(rows)
+        n = len(rows)
+        if n == 0:
+            return
+        self._reserve(n, rows[0])
+        self._fit(rows, weak)
+        self._unshare()
+        cap = self._capacity
+        kept = rows[-cap:]
+        idx = (self._start + self._len + n - len(kept) + np.arange(len(kept))) % cap
+        self._buf[idx] = kept
+        self._buf[idx + cap] = kept
+        overflow = max(self._len + n - cap, 0)
+        self._start = (self._start + overflow) % cap
+        self.evicted += overflow
+        self._len = min(self._len + n, cap)
+        if self.stats is not None:
+            self.stats.update_many(rows)
+
+    def pop(self, index=-1):
+        if index < 0:
+            index += self._len
+        if not 0 <= index < self._len:
+            raise IndexError('pop index out of range')
+        value = self.array[index].copy()
+        if index == 0:
+            self._start = (self._start + 1) % self._capacity
+            self._len -= 1
+        elif index == self._len - 1:
+            self._len -= 1
+        else:
+            rows = np.delete(self.array, index, axis=0)
+            stats, self.stats = self.stats, None # re-inserting rows is not new data
+            self.clear()
+            self.extend(rows)
+            self.stats = stats
+        return value
+
+    def clear(self):
+        super().clear()
+        self._start = 0
+
+    def __setitem__(self, index, value):
+        self._unshare()
+        idx = (self._start + np.arange(self._len)[index]) % self._capacity
+        self._buf[idx] = value
+        self._buf[idx + self._capacity] = value
+
+    @property
+    def capacity(self):
+        return self._capacity
+
+    @property
+    def array(self):
+        if self._buf is None:
+            return np.empty((0,), dtype=self._dtype)
+        return self._buf[self._start:self._start + self._len]
+
+    def __repr__(self):
+        return f"RingColumn({self.array!r}, capacity={self._capacity})"
+
 class ListDict:
     """
     A simple container class that manages multiple named lists as attributes,
@@ -11,11 +442,30 @@ class ListDict:
     - Save and load lists individually or bundled in a single `.npz` file.
     - Supports both compressed and uncompressed saving formats.
     - Handles legacy loading from old save formats.
+    - Incremental streaming: only rows added since the last flush are appended
+      to an on-disk chunked store, optionally evicting them from memory.
+    - Optional columnar mode: keys are `ArrayColumn`s (contiguous, growable
+      NumPy buffers) instead of Python lists.
 
     Methods:
     --------
-    init(*keys):
+    init(*keys, columnar=None, capacity=None):
         Initialize empty lists as attributes for the given keys.
+        With `columnar=True` (default: the value given to the constructor),
+        each key is an `ArrayColumn` whose dtype and row shape are inferred
+        from the first append. `rec.key.array` is a zero-copy view.
+        With `capacity=N`, each key is a `RingColumn` keeping only the last N
+        rows; `pop(index=0)` and appends past capacity are O(1).
+        With `stats=True` (or `ema=alpha`), every append also updates a
+        `RunningStats` of the key (count, mean/var, min/max, EMA). The
+        aggregates cover everything appended; pops do not remove samples.
+
+    get_stats(key):
+        Return the running aggregates of `key` as a dict, in O(1).
+
+    merge_stats(*others, keys=None):
+        Merge the running aggregates of this and other `ListDict`s (e.g.
+        shards of one recording) and return {key: summary}.
 
     get_keys():
         Return a list of all attribute keys currently stored.
@@ -36,11 +486,50 @@ class ListDict:
     load_onefile_old(save_dir='', filename='data_record'):
         Load all lists from an old-style single `.npz` file.
 
-    save_onefile(*keys, save_dir='', filename='data_record', compress=False):
+    save_onefile(*keys, save_dir='', filename='data_record', compress=False, layout='legacy', background=False,
+                 workers=None, chunk_size=1 << 22):
         Save specified lists together into one `.npz` file, optionally compressed.
+        `compress=True` uses NumPy's zlib. `compress` can also name a codec
+        ('zlib', 'lzma', 'bz2', or 'zstd'/'lz4' if `zstandard`/`lz4` is
+        installed): this implies `layout='columns'`, splits every key into
+        `chunk_size`-byte chunks and compresses them on `workers` threads.
+        With `background=True` the current rows are snapshotted (list copies of
+        references / column views, no data copy) and compression and writing run
+        on a worker thread; a `concurrent.futures.Future` is returned and
+        appends may continue meanwhile.
+        `layout='columns'` stores each key as a raw `.npy` member plus a JSON
+        `__meta__` member (kind, dtype, shape), so keys can be loaded one at a
+        time and memory-mapped without unpickling anything.
+
+    load_onefile(*keys, save_dir='', filename='data_record', mmap=False, workers=None):
+        Load specified lists from a single `.npz` file. Both layouts are
+        detected automatically; codec chunks are decompressed on `workers` threads. With `mmap=True`, numeric keys of an
+        uncompressed 'columns' file are set as read-only `np.memmap` arrays.
+        If only a chunked store written by `stream_open` exists, its chunks
+        are reassembled.
+
+    benchmark_codecs(*keys, codecs=('zlib', 'lzma', 'bz2', 'zstd', 'lz4'), workers=None, show=True):
+        Save and load the current records with every available codec and
+        report compression ratio against save/load wall time.
+
+    wait(timeout=None):
+        Block until all background saves finished; re-raise the first error.
 
-    load_onefile(*keys, save_dir='', filename='data_record'):
-        Load specified lists from a single `.npz` file.
+    flush(timeout=None):
+        Flush an open stream (see `stream_flush`) and `wait` for background saves.
+
+    stream_open(*keys, save_dir='', filename='data_record', evict=False):
+        Start streaming the given lists (default: all) to the chunked store
+        `save_dir + filename + '.chunks/'`. An existing store is appended to.
+
+    stream_flush():
+        Append the rows added since the last flush as one new chunk per key.
+        With `evict=True` the flushed rows are dropped from memory. A
+        `RingColumn` must be flushed at least every `capacity` rows, or the
+        rows it overwrote are missing from the store.
+
+    stream_close():
+        Flush the remaining rows and stop streaming.
 
     Usage:
     ------
@@ -49,16 +538,93 @@ class ListDict:
     ld.positions.append([1,2,3])
     ld.save_onefile('positions', 'velocities', save_dir='./data/')
     ld.load_onefile('positions', 'velocities', save_dir='./data/')
+
+    ld = ListDict(columnar=True)
+    ld.init('loss')
+    ld.loss.append(0.5)
+    ld.loss.array  # np.ndarray view, no copy
+
+    ld.init('window', capacity=1000)  # sliding window of the last 1000 rows
+    ld.window.append(0.1)
+    ld.window.mean()
     """
-    def __init__(self) -> None:
-        pass
+    def __init__(self, columnar=False) -> None:
+        self._columnar = columnar
+        self._stream = None
+        self._executor = None
+        self._pending = []
 
-    def init(self, *keys):
+    def init(self, *keys, columnar=None, capacity=None, stats=False, ema=None):
+        if columnar is None:
+            columnar = self._columnar
         for key in keys:
-            setattr(self, key, []) 
+            st = RunningStats(ema) if stats or ema is not None else None
+            if capacity is not None:
+                setattr(self, key, RingColumn(capacity, stats=st))
+            elif columnar:
+                setattr(self, key, ArrayColumn(stats=st))
+            else:
+                setattr(self, key, [] if st is None else StatsList(stats=st))
     
     def get_keys(self):
-        return list(vars(self).keys())
+        return [key for key in vars(self).keys() if not key.startswith('_')]
+
+    def _value(self, key, snapshot=False):
+        # plain array/list for serialisation, so files do not depend on ArrayColumn
+        value = getattr(self, key)
+        if isinstance(value, ArrayColumn):
+            return value.snapshot() if snapshot else np.asarray(value)
+        if isinstance(value, StatsList):
+            return list(value)
+        if snapshot and isinstance(value, list):
+            return value[:] # rows appended later are not part of this save
+        return value
+
+    def get_stats(self, key):
+        stats = getattr(getattr(self, key), 'stats', None)
+        if stats is None:
+            raise ValueError(f"ListDict: key '{key}' was not initialized with stats=True")
+        return stats.summary()
+
+    def merge_stats(self, *others, keys=None):
+        if keys is None:
+            keys = [key for key in self.get_keys() if getattr(getattr(self, key), 'stats', None) is not None]
+        merged = {}
+        for key in keys:
+            stats = RunningStats(getattr(self, key).stats.ema_alpha)
+            for rec in (self,) + others:
+                stats.merge(getattr(rec, key).stats)
+            merged[key] = stats.summary()
+        return merged
+
+    @staticmethod
+    def _rows_to_array(rows):
+        if isinstance(rows, np.ndarray):
+            return rows
+        try:
+            arr = np.asarray(rows)
+            if arr.dtype != object:
+                return arr
+        except ValueError: # ragged rows
+            pass
+        arr = np.empty(len(rows), dtype=object)
+        for k, row in enumerate(rows):
+            arr[k] = row
+        return arr
+
+    def _set_loaded(self, key, value):
+        if hasattr(value, "__len__"):
+            if self._columnar:
+                try:
+                    value = ArrayColumn.from_array(np.asarray(value))
+                    if value.dtype != object:
+                        setattr(self, key, value)
+                        return
+                except ValueError:
+                    pass
+            setattr(self, key, list(value))
+        else:
+            setattr(self, key, value)
     
     def list(self):
         print(self.get_keys())
@@ -66,9 +632,14 @@ class ListDict:
     def pop(self, *keys, index=0):
         if len(keys) == 0:
             keys = self.get_keys()
+        flushed = self._stream['flushed'] if self._stream is not None else {}
         for key in keys:
             # print(key)
-            getattr(self, key).pop(index)
+            value = getattr(self, key)
+            position = index + len(value) if index < 0 else index
+            value.pop(index)
+            if position < flushed.get(key, 0) - getattr(value, 'evicted', 0): # keep the stream offset on the first unflushed row
+                flushed[key] -= 1
     
     def save(self, *keys, save_dir=''):
         for key in keys:
@@ -76,33 +647,390 @@ class ListDict:
             
     def load(self, *keys, save_dir=''):
         for key in keys:
-            setattr(self, key, list(np.load(save_dir + key + '.npz', allow_pickle=True).values()))
+            self._set_loaded(key, list(np.load(save_dir + key + '.npz', allow_pickle=True).values()))
     
     def load_onefile_old(self, save_dir='', filename = 'data_record'):
         d = np.load(save_dir + filename + '.npz', allow_pickle=True)['arr_0'][()]
         for key in list(d.keys()):
-            if hasattr(d[key], "__len__"):
-                setattr(self, key, list(d[key]))
-            else:
-                setattr(self, key, d[key])
+            self._set_loaded(key, d[key])
                 
-    def save_onefile(self, *keys, save_dir='', filename='data_record', compress=False):
+    def save_onefile(self, *keys, save_dir='', filename='data_record', compress=False, layout='legacy',
+                     background=False, workers=None, chunk_size=1 << 22):
         if len(keys) == 0:
             keys = self.get_keys()
+        values = {key: self._value(key, snapshot=background) for key in keys}
+        if not background:
+            return self._write_onefile(values, save_dir + filename, compress, layout, workers, chunk_size)
+        if self._executor is None:
+            from concurrent.futures import ThreadPoolExecutor
+            self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='ListDict-save')
+        self._pending = [f for f in self._pending if not f.done() or f.exception() is not None]
+        future = self._executor.submit(self._write_onefile, values, save_dir + filename, compress, layout,
+                                       workers, chunk_size)
+        self._pending.append(future)
+        return future
+
+    def _write_onefile(self, values, path, compress, layout, workers=None, chunk_size=1 << 22):
         d = {}
-        for key in keys:
-            d[key] = {key: getattr(self, key)}
-        if compress:
-            np.savez_compressed(save_dir + filename, **d)
+        codec = compress if isinstance(compress, str) else None
+        if codec is not None:
+            layout = 'columns'
+        if layout == 'columns':
+            meta = {'layout': 'columns', 'keys': {}}
+            for key, value in values.items():
+                if hasattr(value, "__len__"):
+                    d[key] = self._rows_to_array(value)
+                    kind = 'object' if d[key].dtype == object else 'array'
+                else:
+                    d[key] = np.asarray(value)
+                    kind = 'scalar'
+                meta['keys'][key] = {'kind': kind, 'dtype': str(d[key].dtype), 'shape': list(d[key].shape)}
+            if codec is not None:
+                self._encode_columns(d, meta, codec, workers, chunk_size)
+            d['__meta__'] = np.array(json.dumps(meta))
+        elif layout == 'legacy':
+            for key, value in values.items():
+                d[key] = {key: value}
         else:
-            np.savez(save_dir + filename, **d)
-            
-    def load_onefile(self, *keys, save_dir='', filename='data_record'):
+            raise ValueError(f"ListDict: unknown layout '{layout}'")
+        # write next to the target and rename, so readers never see a partial file
+        if compress is True:
+            np.savez_compressed(path + '.tmp.npz', **d)
+        else:
+            np.savez(path + '.tmp.npz', **d)
+        os.replace(path + '.tmp.npz', path + '.npz')
+
+    @staticmethod
+    def _codec(name):
+        # returns (compress, decompress); zstd and lz4 are only imported when asked for
+        if name == 'zlib':
+            import zlib
+            return (lambda b: zlib.compress(b, 6)), zlib.decompress
+        if name == 'lzma':
+            import lzma
+            return lzma.compress, lzma.decompress
+        if name == 'bz2':
+            import bz2
+            return bz2.compress, bz2.decompress
+        if name == 'zstd':
+            import zstandard
+            return (lambda b: zstandard.ZstdCompressor(level=3).compress(b)), \
+                   (lambda b: zstandard.ZstdDecompressor().decompress(b))
+        if name == 'lz4':
+            import lz4.frame
+            return lz4.frame.compress, lz4.frame.decompress
+        raise ValueError(f"ListDict: unknown codec '{name}'")
+
+    def _encode_columns(self, d, meta, codec, workers, chunk_size):
+        # every key becomes a uint8 member of concatenated, independently compressed chunks
+        from concurrent.futures import ThreadPoolExecutor
+        import pickle
+        compress_fn = self._codec(codec)[0]
+        jobs = {}
+        with ThreadPoolExecutor(max_workers=workers or os.cpu_count()) as pool:
+            for key in meta['keys']:
+                if meta['keys'][key]['kind'] == 'scalar':
+                    continue
+                arr = d[key]
+                if arr.dtype == object:
+                    raw = np.frombuffer(pickle.dumps(list(arr)), dtype=np.uint8)
+                else:
+                    raw = np.ascontiguousarray(arr).reshape(-1).view(np.uint8)
+                jobs[key] = [pool.submit(compress_fn, memoryview(raw[k:k + chunk_size]))
+                             for k in range(0, len(raw), chunk_size)]
+            for key, futures in jobs.items():
+                chunks = [f.result() for f in futures]
+                meta['keys'][key]['codec'] = codec
+                meta['keys'][key]['chunks'] = [len(c) for c in chunks]
+                d[key] = np.frombuffer(b''.join(chunks), dtype=np.uint8)
+
+    def _decode_columns(self, d, meta, keys, workers):
+        from concurrent.futures import ThreadPoolExecutor
+        import pickle
+        out = {}
+        with ThreadPoolExecutor(max_workers=workers or os.cpu_count()) as pool:
+            for key in keys:
+                if 'codec' not in meta[key]:
+                    continue
+                payload = d[key]
+                bounds = np.cumsum([0] + meta[key]['chunks'])
+                decompress_fn = self._codec(meta[key]['codec'])[1]
+                out[key] = [pool.submit(decompress_fn, memoryview(payload[bounds[k]:bounds[k + 1]]))
+                            for k in range(len(bounds) - 1)]
+            for key, futures in out.items():
+                raw = b''.join(f.result() for f in futures)
+                if meta[key]['kind'] == 'object':
+                    out[key] = pickle.loads(raw)
+                else:
+                    out[key] = np.frombuffer(raw, dtype=np.dtype(meta[key]['dtype'])).reshape(meta[key]['shape'])
+        return out
+
+    def benchmark_codecs(self, *keys, codecs=('zlib', 'lzma', 'bz2', 'zstd', 'lz4'), workers=None, show=True):
+        import tempfile, time
+        results = {}
+        with tempfile.TemporaryDirectory() as tmp:
+            for codec in (False, True) + tuple(codecs):
+                name = codec if isinstance(codec, str) else ('numpy-zlib' if codec else 'none')
+                try:
+                    if isinstance(codec, str):
+                        self._codec(codec)
+                except ImportError:
+                    continue
+                t0 = time.perf_counter()
+                self.save_onefile(*keys, save_dir=tmp + '/', filename='bench', compress=codec,
+                                  layout='columns', workers=workers)
+                t1 = time.perf_counter()
+                ListDict().load_onefile(save_dir=tmp + '/', filename='bench', workers=workers)
+                t2 = time.perf_counter()
+                results[name] = {'size': os.path.getsize(tmp + '/bench.npz'), 'save': t1 - t0, 'load': t2 - t1}
+        for name in results:
+            results[name]['ratio'] = results['none']['size'] / results[name]['size']
+            if show:
+                print(f"{name:>11}: ratio {results[name]['ratio']:7.2f}  "
+                      f"save {results[name]['save']:8.3f} s  load {results[name]['load']:8.3f} s")
+        return results
+
+    def wait(self, timeout=None):
+        pending, self._pending = self._pending, []
+        error = None
+        for future in pending:
+            try:
+                future.result(timeout)
+            except Exception as e:
+                error = error or e
+        if error is not None:
+            raise error
+
+    def flush(self, timeout=None):
+        if self._stream is not None:
+            self.stream_flush()
+        self.wait(timeout)
+
+    def load_onefile(self, *keys, save_dir='', filename='data_record', mmap=False, workers=None):
+        if not os.path.exists(save_dir + filename + '.npz') and \
+           os.path.isdir(save_dir + filename + '.chunks'):
+            return self._load_chunks(keys, save_dir + filename + '.chunks')
         d = np.load(save_dir + filename + '.npz', allow_pickle=True)
+        if '__meta__' in d.files:
+            return self._load_columns(d, keys, save_dir + filename + '.npz', mmap, workers)
         if len(keys) == 0:
             keys = list(d.keys())
         for key in keys:
-            if hasattr(d[key][()][key], "__len__"):
-                setattr(self, key, list(d[key][()][key]))
+            self._set_loaded(key, d[key][()][key])
+
+    def _load_columns(self, d, keys, path, mmap, workers=None):
+        meta = json.loads(str(d['__meta__']))['keys']
+        if len(keys) == 0:
+            keys = list(meta.keys())
+        decoded = self._decode_columns(d, meta, keys, workers)
+        for key in keys:
+            kind = meta[key]['kind']
+            if kind == 'scalar':
+                setattr(self, key, d[key][()])
+                continue
+            if key in decoded:
+                self._set_loaded(key, decoded[key])
+                continue
+            arr = self._mmap_member(path, key) if mmap and kind == 'array' else None
+            if arr is not None:
+                setattr(self, key, arr)
             else:
-                setattr(self, key, d[key][()][key])
+                self._set_loaded(key, d[key])
+
+    @staticmethod
+    def _mmap_member(path, key):
+        # only possible for members stored without compression
+        with zipfile.ZipFile(path) as zf:
+            info = zf.getinfo(key + '.npy')
+        if info.compress_type != zipfile.ZIP_STORED:
+            return None
+        with open(path, 'rb') as f:
+            f.seek(info.header_offset)
+            name_len, extra_len = struct.unpack('<HH', f.read(30)[26:30]) # zip local file header
+            f.seek(info.header_offset + 30 + name_len + extra_len)
+            version = np.lib.format.read_magic(f)
+            if version == (1, 0):
+                shape, fortran_order, dtype = np.lib.format.read_array_header_1_0(f)
+            else:
+                shape, fortran_order, dtype = np.lib.format.read_array_header_2_0(f)
+            offset = f.tell()
+        if dtype.hasobject or 0 in shape:
+            return None
+        return np.memmap(path, dtype=dtype, mode='r', offset=offset, shape=shape,
+                         order='F' if fortran_order else 'C')
+
+    def _load_chunks(self, keys, path):
+        if len(keys) == 0:
+            keys = sorted(os.listdir(path))
+        for key in keys:
+            files = sorted(os.listdir(os.path.join(path, key)))
+            chunks = [np.load(os.path.join(path, key, f), allow_pickle=True) for f in files if f.endswith('.npy')]
+            try:
+                value = np.concatenate(chunks) if len(chunks) > 0 else []
+            except ValueError: # row shapes differ between chunks
+                value = [row for chunk in chunks for row in chunk]
+            self._set_loaded(key, value)
+
+    def stream_open(self, *keys, save_dir='', filename='data_record', evict=False):
+        path = save_dir + filename + '.chunks'
+        if not os.path.exists(path):
+            os.makedirs(path)
+        self._stream = {'path': path, 'keys': keys, 'evict': evict, 'flushed': {}}
+
+    def stream_flush(self):
+        if self._stream is None:
+            raise RuntimeError('ListDict: stream_open() has not been called')
+        path, flushed = self._stream['path'], self._stream['flushed']
+        keys = self._stream['keys'] if len(self._stream['keys']) > 0 else self.get_keys()
+        for key in keys:
+            value = getattr(self, key)
+            if not hasattr(value, "__len__"):
+                continue
+            evicted = getattr(value, 'evicted', 0) # a RingColumn drops its oldest rows when full
+            rows = value[max(flushed.get(key, 0) - evicted, 0):]
+            if len(rows) == 0:
+                continue
+            arr = self._rows_to_array(rows)
+            key_dir = os.path.join(path, key)
+            if not os.path.exists(key_dir):
+                os.makedirs(key_dir)
+            n_chunks = len([f for f in os.listdir(key_dir) if f.endswith('.npy')])
+            chunk = os.path.join(key_dir, '%08d.npy' % n_chunks)
+            with open(chunk + '.tmp', 'wb') as f: # never leave a partial chunk behind
+                np.save(f, arr, allow_pickle=arr.dtype == object)
+            os.replace(chunk + '.tmp', chunk)
+            if self._stream['evict']:
+                value.clear()
+                flushed[key] = evicted
+            else:
+                flushed[key] = evicted + len(value)
+
+    def stream_close(self):
+        self.stream_flush()
+        self._stream = None
+
+class SharedColumn(ArrayColumn):
+    """
+    A fixed-capacity `ArrayColumn` living in `multiprocessing.shared_memory`.
+
+    dtype, row shape and capacity are fixed at creation. The column pickles
+    by name, so a worker process that receives it (Process args, Pool
+    initializer, a DataLoader dataset) attaches to the same buffer and writes
+    rows in place. Appends reserve their slot and publish it under a per-key
+    lock around a shared int64 cursor, so readers only ever see fully written
+    rows and `array` in the parent is a zero-copy view.
+    """
+    def __init__(self, capacity, dtype=np.float64, shape=(), mp_context=None) -> None:
+        import multiprocessing as mp
+        from multiprocessing import shared_memory
+        super().__init__(capacity, dtype)
+        self._shape = tuple(shape)
+        nbytes = int(np.prod((self._capacity,) + self._shape)) * np.dtype(dtype).itemsize
+        self._shm = shared_memory.SharedMemory(create=True, size=max(nbytes, 1))
+        self._cursor = (mp_context or mp).Value('q', 0)
+        self._owner = True
+        self._attach()
+
+    def _attach(self):
+        self._buf = np.ndarray((self._capacity,) + self._shape, dtype=self._dtype, buffer=self._shm.buf)
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state['_shm'] = self._shm.name
+        state['_owner'] = False
+        del state['_buf']
+        return state
+
+    def __setstate__(self, state):
+        from multiprocessing import shared_memory
+        self.__dict__.update(state)
+        try:
+            self._shm = shared_memory.SharedMemory(name=state['_shm'], track=False)
+        except TypeError: # Python < 3.13 has no track argument
+            self._shm = shared_memory.SharedMemory(name=state['_shm'])
+        self._attach()
+
+    @property
+    def _len(self):
+        return self._cursor.value
+
+    @_len.setter
+    def _len(self, value):
+        if hasattr(self, '_cursor'):
+            self._cursor.value = value
+
+    def _reserve(self, n, row):
+        if n > self._capacity:
+            raise IndexError(f'SharedColumn: capacity {self._capacity} exceeded')
+
+    def _unshare(self):
+        pass
+
+    def append(self, row):
+        with self._cursor.get_lock():
+            super().append(row)
+
+    def extend(self, rows):
+        with self._cursor.get_lock():
+            super().extend(rows)
+
+    def pop(self, index=-1):
+        with self._cursor.get_lock():
+            return super().pop(index)
+
+    def clear(self):
+        with self._cursor.get_lock():
+            self._cursor.value = 0
+
+    def snapshot(self):
+        # other processes keep writing into the buffer, so a snapshot must copy
+        with self._cursor.get_lock():
+            return self.array.copy()
+
+    def close(self):
+        self._buf = None
+        self._shm.close()
+        if self._owner:
+            self._shm.unlink()
+
+class SharedListDict(ListDict):
+    """
+    A `ListDict` whose keys are `SharedColumn`s, for recording from worker
+    processes without pickling every sample back to the parent.
+
+    Create it in the parent, `init` every key with its dtype and row shape,
+    then hand it to the workers when they are started. Pass `mp_context` if
+    the workers use a non-default start method. Workers call
+    `rec.key.append(x)` and write straight into shared memory; the parent
+    reads `rec.key.array` with zero copies. `save_onefile` writes the same
+    formats as `ListDict`. Call `close()` in the parent to free the memory.
+
+    Usage:
+    ------
+    rec = SharedListDict(capacity=100000)
+    rec.init('obs', dtype=np.float32, shape=(3,))
+    pool = multiprocessing.Pool(4, initializer=worker_init, initargs=(rec,))
+    ...
+    rec.save_onefile(save_dir='./data/')
+    rec.close()
+    """
+    def __init__(self, capacity=100000, mp_context=None) -> None:
+        super().__init__(columnar=True)
+        self._capacity = capacity
+        self._mp_context = mp_context
+
+    def init(self, *keys, dtype=np.float64, shape=(), capacity=None):
+        for key in keys:
+            setattr(self, key, SharedColumn(capacity or self._capacity, dtype, shape, self._mp_context))
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state['_executor'], state['_pending'], state['_stream'] = None, [], None
+        return state
+
+    def close(self):
+        self.wait()
+        for key in self.get_keys():
+            value = getattr(self, key)
+            if isinstance(value, SharedColumn):
+                value.close()
@@ -1,4 +1,5 @@
 import os
+from contextlib import contextmanager
 class Logger:
     """
     Simple logger class for recording experiment outputs and saving files.
@@ -7,6 +8,31 @@ class Logger:
     to a timestamped text file inside a specified directory. It can also save
     the content of a source file (e.g., a Python script) to the experiment folder.
 
+    With `buffered=True` the log file is kept open and lines are collected in
+    memory; a background thread writes them out every `flush_interval` seconds
+    or once `flush_size` characters are pending. Pending lines are also written
+    on `flush()`, `close()`, interpreter exit (atexit) and SIGTERM/SIGHUP. A
+    signal that interrupts a write is handled once the write finished;
+    `close()` removes the atexit entry and restores the previous handlers.
+
+    Structured metrics go to a separate JSON Lines file,
+    `<experiment_name>.metrics.jsonl`, one compact object per `metrics()` call.
+    With `metrics_max_bytes`, the file is rotated to
+    `<experiment_name>.metrics.<k>.jsonl` once it reaches that size, and the
+    rotated segment is compressed ('gzip' or 'zstd') in the background.
+
+    With `multiprocess=True` the creating process is the only writer. Child
+    processes that receive the logger (fork inheritance, Process/Pool
+    initializer arguments) batch their lines and metrics and send them over a
+    `multiprocessing` queue (every `batch_size` records, every `batch_interval`
+    seconds from a timer thread even while the worker is idle, at process exit
+    and on SIGTERM, which is how `Pool.terminate` stops workers). Sends write
+    to the pipe synchronously, so a sent batch survives the worker being
+    killed. A writer thread in the parent appends them in arrival order,
+    prefixing log lines with the producer tag (`producer`, default
+    '<process name>:<pid>'), so lines never interleave and each producer's
+    order is preserved.
+
     Attributes:
     -----------
     save_dir : str
@@ -21,38 +47,596 @@ class Logger:
     create_file(experiment_name):
         Creates or appends a log file with a header including experiment name and timestamp.
 
-    write_file(file):
+    write_file(file, snapshot=False, store_dir=None):
         Copies the content of a given source file into a `.py` file in the save directory.
+        With `snapshot=True`, `file` may also be a list of files or a directory
+        tree: every file is hashed (sha256) and stored once in the shared
+        content-addressed store `store_dir`, and only a small manifest
+        `<experiment_name>.snapshot.json` mapping relative paths to hashes is
+        written for the run. The store is shared between runs: without
+        `store_dir` it is `Logger.snapshot_store`, else the environment variable
+        `UTILSUITE_SNAPSHOT_STORE`, else `snapshot_store/` next to `save_dir`
+        (in its parent directory), so sweep runs with their own `save_dir`
+        under one directory deduplicate against each other. If `save_dir` is
+        the current directory or directly under `/`, the store goes in the
+        current directory instead.
+
+    restore_snapshot(manifest, target_dir):
+        Recreates the files of a snapshot manifest under `target_dir`.
 
     line(*line, print_line=True):
         Prints and logs the provided line(s). Automatically appends to the log file.
+
+    metrics(**values):
+        Appends `values` (e.g. step=..., loss=...) as one JSON line. NumPy/torch
+        scalars and arrays are converted with `.tolist()`.
+
+    read_metrics(*fields):
+        Reads all metric segments (rotated, compressed and current) in order and
+        returns {field: np.ndarray}; missing values are NaN. Default: all fields.
+
+    runs():
+        Returns the run index of the log file: a list of {'offset', 'name', 'time'},
+        one per `create_file` call, read from the `<experiment_name>.txt.idx` sidecar.
+        The sidecar is rebuilt by one scan if it is missing (older log files).
+
+    read_run(run=-1):
+        Returns the text of one run (list position, default the latest) by
+        seeking to its byte offset; cost does not depend on the file size.
+
+    tail(n=20, run=-1):
+        Returns the last `n` lines of a run (default the latest).
+
+    flush():
+        Writes all buffered lines to the log file (buffered mode). In a child
+        of a multiprocess logger, sends the pending batch to the writer.
+
+    close():
+        Flushes, stops the background writer and closes the log file. In a
+        child of a multiprocess logger, sends the pending batch.
     """
-    def __init__(self, save_dir, experiment_name, create_file=True) -> None:
+    snapshot_store = None # default store_dir of write_file(snapshot=True) for all loggers
+
+    def __init__(self, save_dir, experiment_name, create_file=True,
+                 buffered=False, flush_size=1 << 16, flush_interval=1.0,
+                 metrics_max_bytes=None, metrics_compress='gzip',
+                 multiprocess=False, mp_context=None, batch_size=64, batch_interval=0.5) -> None:
         from io import StringIO
+        import threading
         self.s = StringIO()
         self.save_dir = save_dir
         self.experiment_name = experiment_name
+        self.metrics_max_bytes = metrics_max_bytes
+        self.metrics_compress = metrics_compress
+        self._metrics_fh = None
+        self._metrics_lock = threading.RLock()
+        self._main_held = 0         # locks held by the main thread (signal handlers run there)
+        self._signal_pending = None # (signum, previous) deferred until the main thread releases them
+        self._signal_handlers = []
+        self._buffer = None
+        self._queue = None
+        self.producer = None
+        if buffered:
+            self._start_writer(flush_size, flush_interval)
+        if multiprocess:
+            self._start_queue(mp_context, batch_size, batch_interval)
         if create_file:
             self.create_file(experiment_name)
+
+    def _start_writer(self, flush_size, flush_interval):
+        import atexit, threading
+        self.flush_size = flush_size
+        self.flush_interval = flush_interval
+        self._buffer = []
+        self._buffered = 0
+        self._fh = None
+        self._lock = threading.RLock()
+        self._wake = threading.Event()
+        self._closed = False
+        def writer():
+            while not self._closed:
+                self._wake.wait(self.flush_interval)
+                self._wake.clear()
+                self.flush()
+        self._writer = threading.Thread(target=writer, name='Logger-writer', daemon=True)
+        self._writer.start()
+        atexit.register(self.close)
+        if threading.current_thread() is threading.main_thread():
+            self._install_signal_handlers()
+
+    def _start_queue(self, mp_context, batch_size, batch_interval):
+        import atexit, threading
+        import multiprocessing as mp
+        self.batch_size = batch_size
+        self.batch_interval = batch_interval
+        # SimpleQueue.put writes in the calling thread; Queue's feeder thread dies with a killed worker
+        self._queue = (mp_context or mp).SimpleQueue()
+        self._owner_pid = os.getpid()
+        self._batch_pid = None
+        def consumer():
+            while True:
+                item = self._queue.get()
+                if item is None:
+                    break
+                kind, tag, texts = item
+                if kind == 'line':
+                    self._append(''.join(f'[{tag}] {text}' for text in texts))
+                else:
+                    for text in texts:
+                        self._write_metrics(text)
+        self._consumer = threading.Thread(target=consumer, name='Logger-queue', daemon=True)
+        self._consumer.start()
+        atexit.register(self._stop_queue)
+
+    def _stop_queue(self):
+        import atexit
+        if self._consumer is not None:
+            self._queue.put(None)
+            self._consumer.join()
+            self._consumer = None
+            atexit.unregister(self._stop_queue)
+
+    def _is_producer(self):
+        return self._queue is not None and os.getpid() != self._owner_pid
+
+    def _produce(self, kind, text):
+        import time
+        if self._batch_pid != os.getpid(): # first record in this process
+            import threading
+            import multiprocessing as mp
+            from multiprocessing.util import Finalize
+            self._batch_pid = os.getpid()
+            self._batch = {'line': [], 'metrics': []}
+            self._batch_t0 = time.monotonic()
+            self._batch_lock = threading.Lock()
+            self._batch_owner = None  # thread ident holding _batch_lock
+            self._batch_signal = None # SIGTERM deferred until the main thread leaves the lock
+            self._batch_stopped = False
+            if self.producer is None:
+                self.producer = f'{mp.current_process().name}:{os.getpid()}'
+            Finalize(self, self._send_batch, exitpriority=100) # runs at child exit
+            def ticker():
+                # idle workers still deliver within batch_interval
+                while True:
+                    time.sleep(self.batch_interval)
+                    self._send_batch()
+            threading.Thread(target=ticker, name='Logger-batch', daemon=True).start()
+            if threading.current_thread() is threading.main_thread():
+                self._install_producer_handler()
+        self._lock_batch()
+        try:
+            self._batch[kind].append(text)
+            due = len(self._batch['line']) + len(self._batch['metrics']) >= self.batch_size or \
+                  time.monotonic() - self._batch_t0 >= self.batch_interval
+        finally:
+            self._unlock_batch()
+        if due:
+            self._send_batch()
+
+    def _install_producer_handler(self):
+        import signal, threading
+        previous = signal.getsignal(signal.SIGTERM)
+        for sig, inherited, before in self._signal_handlers:
+            if sig == signal.SIGTERM and previous is inherited:
+                previous = before # the parent's buffered flush handler, inherited through fork
+        main = threading.main_thread().ident
+        def handler(signum, frame):
+            if self._batch_owner == main: # interrupted inside a send: finish it first
+                self._batch_signal = (signum, previous)
+                return
+            self._terminate_batch(signum, previous, timeout=1.0)
+        signal.signal(signal.SIGTERM, handler)
+
+    def _terminate_batch(self, signum, previous, timeout=-1):
+        # The queue's write lock is shared with the other processes, so the kill must never
+        # land while this process is writing: send, then stop all further sends before chaining.
+        if self._batch_lock.acquire(timeout=timeout):
+            try:
+                self._put_batch()
+            finally:
+                self._batch_stopped = True
+                self._batch_lock.release()
+        else:
+            self._batch_stopped = True
+        try:
+            self._chain_signal(previous, signum, None)
+        finally:
+            self._batch_stopped = False # the previous handler returned: the process lives on
+
+    @staticmethod
+    def _chain_signal(previous, signum, frame):
+        import signal
+        if callable(previous):
+            previous(signum, frame)
+        elif previous == signal.SIG_DFL:
+            signal.signal(signum, signal.SIG_DFL)
+            os.kill(os.getpid(), signum)
+
+    def _lock_batch(self):
+        import threading
+        self._batch_lock.acquire()
+        self._batch_owner = threading.get_ident()
+
+    def _unlock_batch(self):
+        import threading
+        self._batch_owner = None
+        self._batch_lock.release()
+        if self._batch_signal is not None and threading.current_thread() is threading.main_thread():
+            (signum, previous), self._batch_signal = self._batch_signal, None
+            self._terminate_batch(signum, previous)
+
+    def _put_batch(self):
+        import time
+        if self._batch_stopped:
+            return
+        for kind in ('line', 'metrics'):
+            if self._batch[kind]:
+                self._queue.put((kind, self.producer, self._batch[kind]))
+                self._batch[kind] = []
+        self._batch_t0 = time.monotonic()
+
+    def _send_batch(self):
+        self._lock_batch()
+        try:
+            self._put_batch()
+        finally:
+            self._unlock_batch()
+
+    def __getstate__(self):
+        keys = ('save_dir', 'experiment_name', 'metrics_max_bytes', 'metrics_compress', 'producer',
+                '_queue', '_owner_pid', 'batch_size', 'batch_interval')
+        return {k: self.__dict__[k] for k in keys if k in self.__dict__}
+
+    def __setstate__(self, state):
+        from io import StringIO
+        import threading
+        self.__dict__.update(state)
+        self.s = StringIO()
+        self._metrics_fh = None
+        self._metrics_lock = threading.RLock()
+        self._main_held = 0
+        self._signal_pending = None
+        self._signal_handlers = []
+        self._buffer = None
+        self._batch_pid = None
+
+    def _install_signal_handlers(self):
+        import signal, weakref
+        ref = weakref.ref(self) # a closed logger must not be kept alive by the handler chain
+        for name in ('SIGTERM', 'SIGHUP'):
+            sig = getattr(signal, name, None)
+            if sig is None:
+                continue
+            previous = signal.getsignal(sig)
+            def handler(signum, frame, previous=previous):
+                logger = ref()
+                if logger is None or logger._closed or logger._is_producer(): # forked producer: no file to flush
+                    Logger._chain_signal(previous, signum, frame)
+                elif logger._main_held:
+                    # interrupted while holding a lock (file writes are not reentrant): finish first
+                    logger._signal_pending = (signum, previous)
+                else:
+                    logger.flush()
+                    Logger._chain_signal(previous, signum, frame)
+            signal.signal(sig, handler)
+            self._signal_handlers.append((sig, handler, previous))
+
+    def _remove_signal_handlers(self):
+        import signal, threading
+        if threading.current_thread() is not threading.main_thread():
+            return
+        for sig, handler, previous in self._signal_handlers:
+            if signal.getsignal(sig) is handler: # otherwise another handler chains to ours, which is inert now
+                signal.signal(sig, previous if previous is not None else signal.SIG_DFL)
+        self._signal_handlers = []
+
+    @contextmanager
+    def _hold(self, lock):
+        import threading
+        main = threading.current_thread() is threading.main_thread()
+        with lock:
+            self._main_held += main
+            try:
+                yield
+            finally:
+                self._main_held -= main
+        if main and not self._main_held and self._signal_pending is not None:
+            (signum, previous), self._signal_pending = self._signal_pending, None
+            self.flush()
+            self._chain_signal(previous, signum, None)
+
+    def _append(self, text):
+        if self._buffer is None or self._closed:
+            with open(self.save_dir + self.experiment_name + '.txt', "a") as tgt:
+                tgt.write(text)
+            return
+        with self._hold(self._lock):
+            self._buffer.append(text)
+            self._buffered += len(text)
+            full = self._buffered >= self.flush_size
+        if full:
+            self._wake.set()
+
+    def flush(self):
+        if self._is_producer():
+            if self._batch_pid == os.getpid():
+                self._send_batch()
+            return
+        with self._hold(self._metrics_lock):
+            if self._metrics_fh is not None:
+                self._metrics_fh.flush()
+        if self._buffer is None:
+            return
+        with self._hold(self._lock):
+            if len(self._buffer) == 0:
+                return
+            if self._fh is None:
+                self._fh = open(self.save_dir + self.experiment_name + '.txt', "a")
+            self._fh.write(''.join(self._buffer))
+            self._fh.flush()
+            self._buffer.clear()
+            self._buffered = 0
+
+    def close(self):
+        if self._is_producer():
+            if self._batch_pid == os.getpid():
+                self._send_batch()
+            return
+        if self._queue is not None:
+            self._stop_queue()
+        with self._hold(self._metrics_lock):
+            if self._metrics_fh is not None:
+                self._metrics_fh.close()
+                self._metrics_fh = None
+        if self._buffer is None or self._closed:
+            return
+        import atexit
+        self._closed = True
+        self._wake.set()
+        self._writer.join()
+        self.flush()
+        with self._hold(self._lock):
+            if self._fh is not None:
+                self._fh.close()
+                self._fh = None
+        atexit.unregister(self.close)
+        self._remove_signal_handlers()
     
     def create_file(self, experiment_name):
         import datetime
+        self.flush() # keep buffered lines ahead of the new header
         if not os.path.exists(self.save_dir):
             os.makedirs(self.save_dir)
-        with open(self.save_dir + experiment_name + '.txt', "a") as tgt:
+        import json
+        now = str(datetime.datetime.now())
+        path = self.save_dir + experiment_name + '.txt'
+        offset = os.path.getsize(path) if os.path.exists(path) else 0
+        if offset > 0 and not os.path.exists(path + '.idx'):
+            self._rebuild_index(path) # log from before the index existed: keep its earlier runs
+        with open(path, "a") as tgt:
             tgt.writelines('\n' + '-' * 80 + '\n')
-            tgt.writelines(experiment_name + ' ' + str(datetime.datetime.now()) + '\n')
-        print(experiment_name + ' ' + str(datetime.datetime.now()))
+            tgt.writelines(experiment_name + ' ' + now + '\n')
+        with open(path + '.idx', "a") as idx:
+            idx.write(json.dumps({'offset': offset, 'name': experiment_name, 'time': now}) + '\n')
+        print(experiment_name + ' ' + now)
             
-    def write_file(self, file):
+    def write_file(self, file, snapshot=False, store_dir=None):
+        if snapshot:
+            return self._snapshot(file, store_dir)
         with open(file, "r") as src:
             with open(self.save_dir + self.experiment_name + '.py', "w") as tgt:
                 tgt.write(src.read())
+
+    def _snapshot(self, files, store_dir):
+        import datetime, hashlib, json
+        store_dir = store_dir or Logger.snapshot_store or os.environ.get('UTILSUITE_SNAPSHOT_STORE')
+        if not store_dir:
+            save_dir = os.path.abspath(self.save_dir or '.')
+            parent = os.path.dirname(save_dir)
+            if save_dir == os.getcwd() or os.path.dirname(parent) == parent:
+                parent = os.getcwd() # never spill into the cwd's parent or the filesystem root
+            store_dir = os.path.join(parent, 'snapshot_store')
+        store_dir = os.path.abspath(store_dir)
+        if isinstance(files, str) and os.path.isdir(files):
+            root = os.path.dirname(os.path.abspath(files).rstrip(os.sep))
+            paths = []
+            for dirpath, dirnames, filenames in os.walk(files):
+                dirnames[:] = sorted(d for d in dirnames if d not in ('__pycache__', '.git'))
+                paths.extend(os.path.join(dirpath, f) for f in sorted(filenames) if not f.endswith('.pyc'))
+        else:
+            paths = [files] if isinstance(files, str) else list(files)
+            root = os.path.commonpath([os.path.dirname(os.path.abspath(f)) for f in paths])
+        manifest = {'store': store_dir, 'time': str(datetime.datetime.now()), 'files': {}}
+        for path in paths:
+            with open(path, 'rb') as f:
+                data = f.read()
+            digest = hashlib.sha256(data).hexdigest()
+            blob = os.path.join(store_dir, digest[:2], digest[2:])
+            if not os.path.exists(blob): # identical sources are stored only once
+                os.makedirs(os.path.dirname(blob), exist_ok=True)
+                with open(blob + '.%d.tmp' % os.getpid(), 'wb') as f:
+                    f.write(data)
+                os.replace(blob + '.%d.tmp' % os.getpid(), blob)
+            manifest['files'][os.path.relpath(os.path.abspath(path), root)] = digest
+        if self.save_dir and not os.path.exists(self.save_dir):
+            os.makedirs(self.save_dir)
+        manifest_path = self.save_dir + self.experiment_name + '.snapshot.json'
+        with open(manifest_path, 'w') as f:
+            json.dump(manifest, f, indent=1)
+        return manifest_path
+
+    @staticmethod
+    def restore_snapshot(manifest, target_dir):
+        import json, shutil
+        with open(manifest) as f:
+            manifest = json.load(f)
+        for rel, digest in manifest['files'].items():
+            target = os.path.join(target_dir, rel)
+            os.makedirs(os.path.dirname(target) or '.', exist_ok=True)
+            shutil.copyfile(os.path.join(manifest['store'], digest[:2], digest[2:]), target)
     
     def line(self, *line, print_line=True):
         if print_line: print(*line)
         print(*line, file = self.s)
-        with open(self.save_dir + self.experiment_name + '.txt', "a") as tgt:
-            tgt.writelines(self.s.getvalue())
+        if self._is_producer():
+            self._produce('line', self.s.getvalue())
+        else:
+            self._append(self.s.getvalue())
         self.s.truncate(0)
-        self.s.seek(0)
\ No newline at end of file
+        self.s.seek(0)
+
+    def _metrics_path(self, index=None):
+        if index is None:
+            return self.save_dir + self.experiment_name + '.metrics.jsonl'
+        return self.save_dir + self.experiment_name + '.metrics.%05d.jsonl' % index
+
+    @staticmethod
+    def _jsonable(x):
+        return x.tolist() if hasattr(x, 'tolist') else str(x)
+
+    def metrics(self, **values):
+        import json
+        text = json.dumps(values, separators=(',', ':'), default=self._jsonable) + '\n'
+        if self._is_producer():
+            self._produce('metrics', text)
+        else:
+            self._write_metrics(text)
+
+    def _write_metrics(self, text):
+        with self._hold(self._metrics_lock):
+            if self._metrics_fh is None:
+                if not os.path.exists(self.save_dir):
+                    os.makedirs(self.save_dir)
+                self._metrics_fh = open(self._metrics_path(), 'a')
+            self._metrics_fh.write(text)
+            if self._buffer is None:
+                self._metrics_fh.flush()
+            if self.metrics_max_bytes is not None and self._metrics_fh.tell() >= self.metrics_max_bytes:
+                self._rotate_metrics()
+
+    def _metric_segments(self):
+        # [(index, path)] of rotated segments, oldest first, then the current file
+        import re
+        pattern = re.compile(re.escape(self.experiment_name) + r'\.metrics\.(\d+)\.jsonl(\.gz|\.zst)?$')
+        segments = {}
+        for f in os.listdir(self.save_dir or '.'):
+            m = pattern.match(f)
+            if m:
+                # prefer the compressed file once compression has finished
+                if m.group(2) or int(m.group(1)) not in segments:
+                    segments[int(m.group(1))] = self.save_dir + f
+        out = sorted(segments.items())
+        if os.path.exists(self._metrics_path()):
+            out.append((None, self._metrics_path()))
+        return out
+
+    def _rotate_metrics(self):
+        import threading
+        self._metrics_fh.close()
+        self._metrics_fh = None
+        indices = [k for k, _ in self._metric_segments() if k is not None]
+        rotated = self._metrics_path(max(indices) + 1 if indices else 0)
+        os.replace(self._metrics_path(), rotated)
+        if self.metrics_compress:
+            threading.Thread(target=self._compress_segment, args=(rotated, self.metrics_compress),
+                             daemon=True).start()
+
+    @staticmethod
+    def _compress_segment(path, codec):
+        import shutil
+        if codec == 'gzip':
+            import gzip
+            target = path + '.gz'
+            with open(path, 'rb') as src, gzip.open(target + '.tmp', 'wb') as tgt:
+                shutil.copyfileobj(src, tgt)
+        elif codec == 'zstd':
+            import zstandard
+            target = path + '.zst'
+            with open(path, 'rb') as src, open(target + '.tmp', 'wb') as tgt:
+                zstandard.ZstdCompressor().copy_stream(src, tgt)
+        else:
+            raise ValueError(f"Logger: unknown metrics compression '{codec}'")
+        os.replace(target + '.tmp', target)
+        os.remove(path)
+
+    def read_metrics(self, *fields):
+        import json
+        import numpy as np
+        self.flush()
+        rows = []
+        for _, path in self._metric_segments():
+            if path.endswith('.gz'):
+                import gzip
+                f = gzip.open(path, 'rt')
+            elif path.endswith('.zst'):
+                import io, zstandard
+                f = io.TextIOWrapper(zstandard.ZstdDecompressor().stream_reader(open(path, 'rb')))
+            else:
+                f = open(path, 'r')
+            with f:
+                rows.extend(json.loads(line) for line in f if line.strip())
+        if len(fields) == 0:
+            fields = list(dict.fromkeys(key for row in rows for key in row))
+        out = {}
+        for field in fields:
+            values = [row.get(field, np.nan) for row in rows]
+            try:
+                out[field] = np.array(values, dtype=np.float64)
+            except (TypeError, ValueError): # strings, lists of varying length, ...
+                out[field] = np.array(values, dtype=object)
+        return out
+
+    def _rebuild_index(self, path):
+        import json
+        separator = b'\n' + b'-' * 80 + b'\n'
+        entries = []
+        with open(path, 'rb') as f:
+            data = f.read()
+        start = data.find(separator)
+        while start != -1:
+            header_end = data.find(b'\n', start + len(separator))
+            header = data[start + len(separator):header_end if header_end != -1 else None].decode()
+            name, _, time = header.rpartition(' ')
+            name, _, date = name.rpartition(' ')
+            entries.append({'offset': start, 'name': name, 'time': date + ' ' + time})
+            start = data.find(separator, start + len(separator))
+        with open(path + '.idx', 'w') as idx:
+            idx.writelines(json.dumps(e) + '\n' for e in entries)
+
+    def runs(self):
+        import json
+        path = self.save_dir + self.experiment_name + '.txt'
+        if not os.path.exists(path + '.idx'):
+            self._rebuild_index(path)
+        with open(path + '.idx') as idx:
+            return [json.loads(line) for line in idx if line.strip()]
+
+    def read_run(self, run=-1):
+        self.flush()
+        path = self.save_dir + self.experiment_name + '.txt'
+        runs = self.runs()
+        start = runs[run]['offset']
+        position = run if run >= 0 else len(runs) + run
+        end = runs[position + 1]['offset'] if position + 1 < len(runs) else None
+        with open(path, 'rb') as f:
+            f.seek(start)
+            data = f.read() if end is None else f.read(end - start)
+        return data.decode()
+
+    def tail(self, n=20, run=-1):
+        self.flush()
+        path = self.save_dir + self.experiment_name + '.txt'
+        runs = self.runs()
+        position = run if run >= 0 else len(runs) + run
+        start = runs[position]['offset']
+        end = runs[position + 1]['offset'] if position + 1 < len(runs) else os.path.getsize(path)
+        # read backwards in blocks until n lines are found or the run start is reached
+        data, block = b'', 1 << 16
+        with open(path, 'rb') as f:
+            pos = end
+            while pos > start and data.count(b'\n') <= n:
+                step = min(block, pos - start)
+                pos -= step
+                f.seek(pos)
+                data = f.read(step) + data
+        return data.decode(errors='replace').splitlines()[-n:]